@@ -4,9 +4,25 @@ desktop-app/make_dog_lottie.py
 Python으로 상태별 고품질 강아지 Lottie JSON을 생성한다.
 RLottie-python의 제약을 피하기 위해 베지어 패스로 모든 도형을 구성하며,
 각 상태별로 움직임 보간, 다관절 부모-자식 레이어링, 풍부한 액션을 적용합니다.
+
+생성 결과는 desktop-app/assets/lottie/ 에 커밋되어 있으므로, 도형/애니메이션을
+고쳤을 때만 다시 실행하면 된다 (개발자용 1회성 스크립트).
+
+Usage:
+    python desktop-app/make_dog_lottie.py                    # assets/lottie/ 갱신
+    python desktop-app/make_dog_lottie.py --pack-dotlottie   # + puppy.lottie 묶음
+    python desktop-app/make_dog_lottie.py --force            # 전부 다시 생성
+
+출력 파일이 스크립트보다 새로우면 건너뛴다 (compact 기본 출력일 때만; --indent를
+주면 항상 다시 쓴다). git checkout/pull 뒤에는 파일 mtime이 체크아웃 순서대로
+정해져 이 비교를 믿을 수 없으므로, 스크립트를 고친 커밋을 받은 뒤에는 --force로
+다시 생성할 것.
 """
 from __future__ import annotations
-import argparse, json, math
+import argparse, json, math, zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
 # --- 고품질 팔레트 ---
@@ -35,94 +51,167 @@ BG_ALERT      = [1.00, 0.92, 0.82, 0.92]
 BG_CELEBRATE  = [0.95, 0.88, 1.00, 0.92]
 BG_SLEEPING   = [0.85, 0.90, 0.98, 0.92]
 
+BG_BY_TYPE = {
+    "idle":      BG_IDLE,
+    "working":   BG_WORKING,
+    "alert":     BG_ALERT,
+    "celebrate": BG_CELEBRATE,
+    "sleeping":  BG_SLEEPING,
+}
+
 KAPPA = 0.5519150244935105
+_ZERO = (0, 0)  # 탄젠트 없는 꼭짓점용 공유 핸들 (튜플이라 변경 불가)
 
 # ---------------------------------------------------------------------------
 # 베지어 헬퍼
 # ---------------------------------------------------------------------------
+# (rx, ry) -> (in 핸들, out 핸들). 장면 전체에서 반지름 조합은 몇 개뿐이다.
+_oval_cache: dict[tuple, tuple] = {}
+
+def _oval_handles(rx: float, ry: float) -> tuple:
+    handles = _oval_cache.get((rx, ry))
+    if handles is None:
+        kx, ky = KAPPA * rx, KAPPA * ry
+        handles = (((-kx, 0), (0, -ky), (kx, 0), (0, ky)),
+                   ((kx, 0), (0, ky), (-kx, 0), (0, -ky)))
+        _oval_cache[(rx, ry)] = handles
+    return handles
+
 def oval_path(cx: float, cy: float, rx: float, ry: float) -> dict:
-    kx, ky = KAPPA * rx, KAPPA * ry
+    i, o = _oval_handles(rx, ry)
     return {
-        "v": [[cx, cy-ry], [cx+rx, cy], [cx, cy+ry], [cx-rx, cy]],
-        "i": [[-kx, 0], [0, -ky], [kx, 0], [0, ky]],
-        "o": [[kx, 0], [0, ky], [-kx, 0], [0, -ky]],
+        "v": ((cx, cy-ry), (cx+rx, cy), (cx, cy+ry), (cx-rx, cy)),
+        "i": i,
+        "o": o,
         "c": True
     }
 
+# 둥근 사각형 꼭짓점 템플릿: xs=(x0, x0+r, x1-r, x1), ys=(y0, y0+r, y1-r, y1) 의 인덱스 쌍
+_RECT_V_IDX = ((1, 0), (2, 0), (3, 1), (3, 2), (2, 3), (1, 3), (0, 2), (0, 1))
+_RECT_ZERO_HANDLES = (_ZERO,) * 4
+
+@lru_cache(maxsize=64)
+def _rect_handles(r: float) -> tuple:
+    k = KAPPA * r
+    return ((_ZERO, (-k,0), (0,-k), _ZERO, _ZERO, (k,0), (0,k), _ZERO),
+            ((k,0), _ZERO, _ZERO, (0,k), (-k,0), _ZERO, _ZERO, (0,-k)))
+
 def rect_path(cx: float, cy: float, w: float, h: float, r: float = 0) -> dict:
     r = min(r, w/2, h/2)
     x0, x1 = cx - w/2, cx + w/2
     y0, y1 = cy - h/2, cy + h/2
-    k = KAPPA * r
     if r == 0:
-        return {"v": [[x0, y0], [x1, y0], [x1, y1], [x0, y1]],
-                "i": [[0,0], [0,0], [0,0], [0,0]], "o": [[0,0], [0,0], [0,0], [0,0]], "c": True}
+        return {"v": ((x0, y0), (x1, y0), (x1, y1), (x0, y1)),
+                "i": _RECT_ZERO_HANDLES, "o": _RECT_ZERO_HANDLES, "c": True}
+    xs = (x0, x0+r, x1-r, x1)
+    ys = (y0, y0+r, y1-r, y1)
+    i, o = _rect_handles(r)
     return {
-        "v": [[x0+r, y0], [x1-r, y0], [x1, y0+r], [x1, y1-r],
-              [x1-r, y1], [x0+r, y1], [x0, y1-r], [x0, y0+r]],
-        "i": [[0,0], [-k,0], [0,-k], [0,0], [0,0], [k,0], [0,k], [0,0]],
-        "o": [[k,0], [0,0], [0,0], [0,k], [-k,0], [0,0], [0,0], [0,-k]],
+        "v": tuple((xs[a], ys[b]) for a, b in _RECT_V_IDX),
+        "i": i,
+        "o": o,
         "c": True
     }
 
+@lru_cache(maxsize=8)
+def _star_dirs(n: int) -> tuple:
+    """n각 별의 꼭짓점 방향 (cos, sin) 테이블. 삼각함수는 n마다 한 번만 계산."""
+    return tuple((math.cos(a), math.sin(a))
+                 for a in (math.pi * j / n - math.pi / 2 for j in range(n*2)))
+
 def star_path(cx: float, cy: float, ro: float, ri: float, n: int=5) -> dict:
-    v, i, o = [], [], []
-    for j in range(n*2):
-        a = math.pi * j / n - math.pi / 2
-        r = ro if j%2==0 else ri
-        v.append([cx + r*math.cos(a), cy + r*math.sin(a)])
-        i.append([0,0]); o.append([0,0])
-    return {"v": v, "i": i, "o": o, "c": True}
+    radii = (ro, ri)
+    v = tuple((cx + radii[j%2]*c, cy + radii[j%2]*s)
+              for j, (c, s) in enumerate(_star_dirs(n)))
+    zeros = (_ZERO,) * (n*2)
+    return {"v": v, "i": zeros, "o": zeros, "c": True}
 
 # ---------------------------------------------------------------------------
 # 로티 빌더
 # ---------------------------------------------------------------------------
+# 고정 속성값 풀: 같은 값이면 같은 dict를 돌려준다. 출력 트리는 만든 뒤 변경하지 않으므로
+# 공유해도 안전하며, 시퀀스 값은 튜플로 고정해 호출자 리스트와 분리한다.
+_STATIC_POOL: dict = {}
+
 def static(v):
-    return {"a": 0, "k": v}
+    if isinstance(v, dict):
+        return {"a": 0, "k": v}
+    if isinstance(v, (list, tuple)):
+        key = v = tuple(v)
+    else:
+        key = (type(v), v)
+    d = _STATIC_POOL.get(key)
+    if d is None:
+        d = _STATIC_POOL[key] = {"a": 0, "k": v}
+    return d
+
+# 거의 모든 레이어/그룹에서 쓰이는 고정 속성값. 출력 트리는 읽기 전용이므로 공유한다.
+_STATIC_0       = static(0)
+_STATIC_100     = static(100)
+_STATIC_ORIGIN2 = static((0, 0))
+_STATIC_ORIGIN3 = static((0, 0, 0))
+_STATIC_SCALE2  = static((100, 100))
+_STATIC_SCALE3  = static((100, 100, 100))
 
 def animated(kfs):
     return {"a": 1, "k": kfs}
 
+# 이징 핸들은 모든 키프레임이 공유한다 (변경 금지)
+_SMOOTH_I = {"x": (0.33,), "y": (1,)}
+_SMOOTH_O = {"x": (0.33,), "y": (0,)}
+_LINEAR_I = {"x": (0,), "y": (0,)}
+_LINEAR_O = {"x": (1,), "y": (1,)}
+
 def kf(t: int, s, e=None, ease="smooth") -> dict:
-    if type(s) not in (list, tuple): s = [s]
+    if not isinstance(s, (list, tuple)): s = [s]
     frame = {"t": t, "s": s}
     if e is not None:
-        if type(e) not in (list, tuple): e = [e]
+        if not isinstance(e, (list, tuple)): e = [e]
         frame["e"] = e
         if ease == "smooth":
-            frame["i"] = {"x": [0.33], "y": [1]}
-            frame["o"] = {"x": [0.33], "y": [0]}
+            frame["i"] = _SMOOTH_I
+            frame["o"] = _SMOOTH_O
         elif ease == "linear":
-            frame["i"] = {"x": [0], "y": [0]}
-            frame["o"] = {"x": [1], "y": [1]}
+            frame["i"] = _LINEAR_I
+            frame["o"] = _LINEAR_O
     return frame
 
 def make_oscillation(n_frames, max_t, val1, val2, ease="smooth"):
+    if not isinstance(val1, (list, tuple)): val1 = [val1]
+    if not isinstance(val2, (list, tuple)): val2 = [val2]
     kfs = []
-    for t in range(0, max_t + 1, n_frames):
-        idx = t // n_frames
+    ve = val1
+    for idx, t in enumerate(range(0, max_t + 1, n_frames)):
         vs = val1 if idx%2==0 else val2
         ve = val2 if idx%2==0 else val1
         
-        if type(vs) not in (list, tuple): vs = [vs]
-        
         if t == max_t:
             kfs.append({"t": t, "s": vs})
         else:
             kfs.append(kf(t, vs, ve, ease))
-    if kfs[-1]["t"] < max_t:
-        kfs.append({"t": max_t, "s": kfs[-1]["e"]})
+    # max_t가 n_frames로 나눠떨어지지 않으면 마지막 구간의 도착값으로 끝 프레임을 고정
+    if not kfs or kfs[-1]["t"] != max_t:
+        kfs.append({"t": max_t, "s": ve})
     return kfs
 
-def path_shape(pd):   return {"ty": "sh", "nm": "path", "ks": static(pd)}
-def fill_shape(c, o=100): return {"ty": "fl", "nm": "fill", "c": static(c), "o": static(o), "r": 1}
+# 같은 도형/색상은 장면 간에 동일한 dict를 공유한다 (출력 트리는 읽기 전용).
+@lru_cache(maxsize=256)
+def _path_shape_cached(v, i, o, c) -> dict:
+    return {"ty": "sh", "nm": "path", "ks": static({"v": v, "i": i, "o": o, "c": c})}
+
+@lru_cache(maxsize=32)
+def _fill_shape_cached(c: tuple, o) -> dict:
+    return {"ty": "fl", "nm": "fill", "c": static(c), "o": _STATIC_100 if o == 100 else static(o), "r": 1}
+
+def path_shape(pd):       return _path_shape_cached(pd["v"], pd["i"], pd["o"], pd["c"])
+def fill_shape(c, o=100): return _fill_shape_cached(tuple(c), o)
 
 def shape_group(nm, items):
     return {
         "ty": "gr", "nm": nm,
         "it": items + [{
-            "ty": "tr", "p": static([0,0]), "a": static([0,0]),
-            "s": static([100,100]), "r": static(0), "o": static(100), "sk": static(0), "sa": static(0)
+            "ty": "tr", "p": _STATIC_ORIGIN2, "a": _STATIC_ORIGIN2,
+            "s": _STATIC_SCALE2, "r": _STATIC_0, "o": _STATIC_100, "sk": _STATIC_0, "sa": _STATIC_0
         }]
     }
 
@@ -132,6 +221,15 @@ def solid_oval(nm, cx, cy, rx, ry, col):
 def solid_rect(nm, cx, cy, w, h, r, col):
     return shape_group(nm, [path_shape(rect_path(cx, cy, w, h, r)), fill_shape(col)])
 
+def solid_ovals(specs) -> list:
+    """(nm, cx, cy, rx, ry, col) 스펙 표에서 타원 그룹들을 한 번에 만든다.
+    KAPPA 핸들은 (rx, ry)별로 미리 계산해 두고 꼭짓점만 평행이동한다."""
+    handles = {(rx, ry): _oval_handles(rx, ry) for _, _, _, rx, ry, _ in specs}
+    return [shape_group(nm, [_path_shape_cached(((cx, cy-ry), (cx+rx, cy), (cx, cy+ry), (cx-rx, cy)),
+                                                *handles[rx, ry], True),
+                             fill_shape(col)])
+            for nm, cx, cy, rx, ry, col in specs]
+
 def layer_base(ind: int, nm: str, op: int, px=0, py=0,
                pos_kf=None, rot_kf=None, scl_kf=None, opa_kf=None, parent: int=None) -> dict:
     lyr = {
@@ -139,10 +237,10 @@ def layer_base(ind: int, nm: str, op: int, px=0, py=0,
         "ip": 0, "op": op, "st": 0, "bm": 0,
         "ks": {
             "p": animated(pos_kf) if pos_kf else static([px, py, 0]),
-            "a": static([0, 0, 0]),
-            "s": animated(scl_kf) if scl_kf else static([100, 100, 100]),
-            "r": animated(rot_kf) if rot_kf else static(0),
-            "o": animated(opa_kf) if opa_kf else static(100),
+            "a": _STATIC_ORIGIN3,
+            "s": animated(scl_kf) if scl_kf else _STATIC_SCALE3,
+            "r": animated(rot_kf) if rot_kf else _STATIC_0,
+            "o": animated(opa_kf) if opa_kf else _STATIC_100,
         },
         "shapes": []
     }
@@ -164,16 +262,20 @@ def lottie_doc(nm: str, fr: int, op: int, layers: list) -> dict:
 
 # ---------------------------------------------------------------------------
 # 고품질 캐릭터 부위 그리기
+# 상태와 무관한 부위는 한 번만 만들어 튜플로 캐시하고, 장면마다 list()로 꺼내 쓴다.
 # ---------------------------------------------------------------------------
+@lru_cache(maxsize=1)
 def shadow_shapes():
-    return [solid_oval("shadow", 0, 0, 55, 10, SHADOW_COLOR)]
+    return (solid_oval("shadow", 0, 0, 55, 10, SHADOW_COLOR),)
 
+@lru_cache(maxsize=1)
 def tail_shapes():
-    return [solid_oval("tail", 0, -18, 10, 28, TAIL_COLOR)]
+    return (solid_oval("tail", 0, -18, 10, 28, TAIL_COLOR),)
 
+@lru_cache(maxsize=1)
 def leg_shapes():
     DARK_LEG = [0.75, 0.45, 0.15, 1]
-    return [
+    return (
         # 뒷다리
         solid_rect("leg_rl", -18, 8, 12, 22, 6, DARK_LEG),
         solid_rect("leg_rr", 18, 8, 12, 22, 6, DARK_LEG),
@@ -183,59 +285,76 @@ def leg_shapes():
         # 앞발
         solid_oval("paw_fl", -10, 25, 16, 8, BELLY_COLOR),
         solid_oval("paw_fr", 10, 25, 16, 8, BELLY_COLOR),
-    ]
+    )
 
+@lru_cache(maxsize=1)
 def body_shapes():
-    return [
+    return (
         solid_oval("body_main", 0, 5, 45, 38, BODY_COLOR),
         solid_oval("body_belly", 0, 16, 30, 24, BELLY_COLOR),
-    ]
+    )
 
+@lru_cache(maxsize=1)
 def collar_shapes():
-    return [
+    return (
         solid_rect("collar_band", 0, -2, 38, 8, 4, COLLAR_COLOR),
         solid_oval("tag", 0, 5, 6, 6, TAG_COLOR),
         solid_oval("tag_hole", 0, 3, 1.5, 1.5, [0,0,0,0.5]),
-    ]
+    )
 
+@lru_cache(maxsize=1)
 def head_shapes():
-    return [
+    return (
         solid_oval("head_base", 0, 0, 42, 36, BODY_COLOR),
         solid_oval("spot", -16, -6, 15, 18, SPOT_COLOR),
-    ]
+    )
 
+@lru_cache(maxsize=1)
 def ear_shapes():
-    return [solid_oval("ear", 0, 0, 12, 24, EAR_COLOR)]
+    return (solid_oval("ear", 0, 0, 12, 24, EAR_COLOR),)
+
+# 얼굴 타원 스펙 표: (nm, cx, cy, rx, ry, col)
+_MUZZLE_SPECS = (
+    # 주둥이와 코
+    ("muzzle",     0, 10, 22, 14, BELLY_COLOR),
+    ("nose",       0,  4,  9,  6, NOSE_COLOR),
+    ("nose_shine", -2, 3,  2,  1, WHITE),
+)
+_SQUINT_EYE_SPECS = (
+    ("left_eye",  -16, -4, 6, 2, EYE_COLOR),
+    ("right_eye",  16, -4, 6, 2, EYE_COLOR),
+)
+_OPEN_EYE_SPECS = (
+    ("left_eye",  -16, -4, 5, 8, EYE_COLOR),
+    ("right_eye",  16, -4, 5, 8, EYE_COLOR),
+    ("left_hi",   -18, -6, 2, 3, WHITE),
+    ("right_hi",   14, -6, 2, 3, WHITE),
+)
 
 def face_shapes(eye_squint, eye_close):
-    shapes = [
-        # 주둥이와 코
-        solid_oval("muzzle", 0, 10, 22, 14, BELLY_COLOR),
-        solid_oval("nose", 0, 4, 9, 6, NOSE_COLOR),
-        solid_oval("nose_shine", -2, 3, 2, 1, WHITE),
-    ]
+    shapes = solid_ovals(_MUZZLE_SPECS)
     if eye_close:
         shapes.append(solid_rect("left_eye",  -16, -2, 10, 2, 1, EYE_COLOR))
         shapes.append(solid_rect("right_eye",  16, -2, 10, 2, 1, EYE_COLOR))
     elif eye_squint:
-        shapes.append(solid_oval("left_eye",  -16, -4, 6, 2, EYE_COLOR))
-        shapes.append(solid_oval("right_eye",  16, -4, 6, 2, EYE_COLOR))
+        shapes.extend(solid_ovals(_SQUINT_EYE_SPECS))
     else:
-        shapes.append(solid_oval("left_eye",  -16, -4, 5, 8, EYE_COLOR))
-        shapes.append(solid_oval("right_eye",  16, -4, 5, 8, EYE_COLOR))
-        shapes.append(solid_oval("left_hi",  -18, -6, 2, 3, WHITE))
-        shapes.append(solid_oval("right_hi",  14, -6, 2, 3, WHITE))
+        shapes.extend(solid_ovals(_OPEN_EYE_SPECS))
     return shapes
 
+@lru_cache(maxsize=1)
 def tongue_shapes():
-    # 혀
-    return [solid_oval("tongue", 0, 18, 8, 14, TONGUE_COLOR)]
+    # 혀 (working/celebrate 공용)
+    return (solid_oval("tongue", 0, 18, 8, 14, TONGUE_COLOR),)
 
 # ---------------------------------------------------------------------------
 # 중앙 장면 코디네이터
 # ---------------------------------------------------------------------------
 def make_dog_scene(name, op, bg_color, anim_type):
+    # Lottie는 배열 뒤쪽 레이어일수록 나중에 그려져 위에 보인다 → ind 큰 것부터 append.
+    # 상태별 레이어(혀 4, 별 3, 알림 2)는 overlays에 모아 두었다가 맨 뒤에 붙인다.
     layers = []
+    overlays = []
     layers.append(bg_circle_layer(99, op, bg_color))
     
     face_sq = False; face_cl = False; show_tongue = False
@@ -266,8 +385,8 @@ def make_dog_scene(name, op, bg_color, anim_type):
         t_scl = make_oscillation(4, op, [100,100,100], [100,120,100])
         t_lyr = layer_base(4, "tongue", op, px=0, py=0, scl_kf=t_scl, parent=8)
         t_lyr["ks"]["a"] = static([0, 16, 0])
-        t_lyr["shapes"] = tongue_shapes()
-        layers.append(t_lyr)
+        t_lyr["shapes"] = list(tongue_shapes())
+        overlays.append(t_lyr)
 
     elif anim_type == "alert":
         # 깜짝 놀라며 귀가 쫑긋 서고 알림표시!
@@ -286,7 +405,7 @@ def make_dog_scene(name, op, bg_color, anim_type):
             shape_group("bar", [path_shape(rect_path(0, -3, 5, 12, 2)), fill_shape(WHITE)]),
             shape_group("dot", [path_shape(oval_path(0, 7, 2.5, 2.5)), fill_shape(WHITE)]),
         ]
-        layers.append(ring)
+        overlays.append(ring)
 
     elif anim_type == "celebrate":
         # 펄쩍펄쩍 점프 + 별 파티클
@@ -312,16 +431,16 @@ def make_dog_scene(name, op, bg_color, anim_type):
             lyr["shapes"] = [shape_group("star", [path_shape(star_path(0,0,12,5,5)), fill_shape(clr)])]
             return lyr
         
-        layers.extend([
+        # 혀 고정
+        t_lyr = layer_base(4, "tongue", op, px=0, py=0, parent=8)
+        t_lyr["shapes"] = list(tongue_shapes())
+        overlays.append(t_lyr)
+
+        overlays.extend([
             mk_star(3,  55, 55,  0, STAR_YELLOW), mk_star(3, 142, 42,  8, STAR_YELLOW),
             mk_star(3, 155, 85, 16, STAR_PINK),   mk_star(3,  38, 82, 22, STAR_YELLOW),
             mk_star(3, 100, 15,  4, STAR_PINK),
         ])
-        
-        # 혀 고정
-        t_lyr = layer_base(4, "tongue", op, px=0, py=0, parent=8)
-        t_lyr["shapes"] = tongue_shapes()
-        layers.append(t_lyr)
 
     elif anim_type == "sleeping":
         face_cl = True
@@ -332,48 +451,47 @@ def make_dog_scene(name, op, bg_color, anim_type):
 
     # --- 공통 레이어 빌드 ---
     shadow = layer_base(20, "shadow", op, px=100, py=148, scl_kf=shadow_scale)
-    shadow["shapes"] = shadow_shapes()
+    shadow["shapes"] = list(shadow_shapes())
     layers.append(shadow)
 
     tail = layer_base(15, "tail", op, px=135, py=110, rot_kf=tail_rot)
     tail["ks"]["a"] = static([0, 10, 0])
-    tail["shapes"] = tail_shapes()
+    tail["shapes"] = list(tail_shapes())
     layers.append(tail)
 
     legs = layer_base(12, "legs", op, pos_kf=leg_pos)
-    legs["shapes"] = leg_shapes()
+    legs["shapes"] = list(leg_shapes())
     layers.append(legs)
 
     body = layer_base(10, "body", op, pos_kf=body_pos)
-    body["shapes"] = body_shapes()
+    body["shapes"] = list(body_shapes())
     layers.append(body)
 
-    # 헤드 중심점
-    head = layer_base(8, "head", op, pos_kf=head_pos)
-    head["shapes"] = head_shapes()
-    layers.append(head)
-
     # 목줄 (head를 따라가도록 parent=8)
     collar = layer_base(9, "collar", op, px=0, py=26, parent=8)
-    collar["shapes"] = collar_shapes()
+    collar["shapes"] = list(collar_shapes())
     layers.append(collar)
 
+    # 헤드 중심점
+    head = layer_base(8, "head", op, pos_kf=head_pos)
+    head["shapes"] = list(head_shapes())
+    layers.append(head)
+
     l_ear_rot, r_ear_rot = None, None
     if ear_rot:
-        l_ear_rot = []
-        r_ear_rot = []
-        for f in ear_rot:
-            lf = f.copy(); rf = f.copy(); lf["s"] = [f["s"][0]]; rf["s"] = [-f["s"][0]]
-            if "e" in f: lf["e"] = [f["e"][0]]; rf["e"] = [-f["e"][0]]
-            l_ear_rot.append(lf); r_ear_rot.append(rf)
+        # 오른쪽 귀는 회전 방향만 뒤집는다 (t/i/o 이징은 원본 키프레임과 공유)
+        l_ear_rot = [{**f, "s": [f["s"][0]], **({"e": [f["e"][0]]} if "e" in f else {})}
+                     for f in ear_rot]
+        r_ear_rot = [{**f, "s": [-f["s"][0]], **({"e": [-f["e"][0]]} if "e" in f else {})}
+                     for f in ear_rot]
 
     left_ear = layer_base(7, "left_ear", op, px=-18, py=-8, rot_kf=l_ear_rot, parent=8)
     left_ear["ks"]["a"] = static([0, -12, 0])
-    left_ear["shapes"] = ear_shapes()
+    left_ear["shapes"] = list(ear_shapes())
     
     right_ear = layer_base(6, "right_ear", op, px=18, py=-8, rot_kf=r_ear_rot, parent=8)
     right_ear["ks"]["a"] = static([0, -12, 0])
-    right_ear["shapes"] = ear_shapes()
+    right_ear["shapes"] = list(ear_shapes())
     
     layers.extend([left_ear, right_ear])
 
@@ -381,38 +499,97 @@ def make_dog_scene(name, op, bg_color, anim_type):
     face_layer["shapes"] = face_shapes(face_sq, face_cl)
     layers.append(face_layer)
 
-    # 앞서 배치된 레이어들을 ind 숫자에 맞춰 정렬 (낮을수록 위로 렌더링하도록 의도했으나, 
-    # Lottie는 배열 아래로 갈수록 상단에 렌더링되므로, 순서를 반대로 정렬하거나 인덱스를 역순으로 설정)
-    # Lottie Docs: 배열의 뒤쪽 요소일수록 나중에 그려짐 => 위에 보임.
-    # 우리의 레이어 인덱스: Shadow 20, Tail 15, Legs 12, Body 10, Collar 9, Head 8, Ears 7, Face 5, BG 99
-    # => 큰 인덱스부터 정렬 (역순) 하면 작은 값이 배열 뒤쪽으로 가므로, Face(5)가 맨 마지막 => 맨 위에 렌더링됨!
-    layers.sort(key=lambda x: x["ind"], reverse=True)
+    layers.extend(overlays)
+    # 우리의 레이어 인덱스: BG 99, Shadow 20, Tail 15, Legs 12, Body 10, Collar 9, Head 8,
+    # Ears 7/6, Face 5, (Tongue 4, Stars 3, Alert 2) → 이미 내림차순이므로 정렬 불필요
+    inds = list(map(itemgetter("ind"), layers))
+    assert inds == sorted(inds, reverse=True), f"layer order: {inds}"
     
     fname = f"puppy_{anim_type}" 
     if anim_type == "sleeping": fname = "Puppy sleeping" # 예외처리 원본 유지용
     return lottie_doc(fname, 30, op, layers)
 
+ASSET_DIR = Path(__file__).resolve().parent / "assets" / "lottie"
+
+# (출력 파일명, 총 프레임, 상태)
+SCENES = [
+    ("puppy_idle.json",      90,  "idle"),
+    ("puppy_working.json",   60,  "working"),
+    ("puppy_alert.json",     45,  "alert"),
+    ("puppy_celebrate.json", 75,  "celebrate"),
+    ("Puppy sleeping.json",  120, "sleeping"),
+]
+
+def pack_dotlottie(out: Path, archive: Path) -> Path:
+    """out 디렉터리의 장면 JSON들을 하나의 dotLottie(ZIP) 아카이브로 묶는다."""
+    def add(zf, name, data):
+        # 고정 타임스탬프 → 내용이 같으면 아카이브도 바이트 단위로 같다
+        info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        zf.writestr(info, data, compresslevel=9)
+
+    with zipfile.ZipFile(archive, "w") as zf:
+        animations = []
+        for fname, op, atype in SCENES:
+            add(zf, f"animations/{atype}.json", (out / fname).read_bytes())
+            animations.append({"id": atype, "frameRate": 30, "totalFrames": op,
+                               "speed": 1, "loop": True, "autoplay": True})
+        manifest = {"version": "1", "generator": "make_dog_lottie.py", "animations": animations}
+        add(zf, "manifest.json", json.dumps(manifest, separators=(",", ":")))
+    return archive
+
+def _build_one(job) -> tuple:
+    """장면 하나를 만들어 파일로 쓴다. ProcessPoolExecutor에서 호출되므로 모듈 최상위 함수."""
+    fname, op, atype, path, indent = job
+    doc = make_dog_scene(fname, op, BG_BY_TYPE[atype], atype)
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        if indent is None:
+            # json.dump은 C 인코더를 못 쓰고 순수 파이썬 경로로 돌아 ~5배 느리다.
+            # compact 문서는 수백 KB라 한 번에 인코딩해서 쓰는 편이 낫다.
+            f.write(json.dumps(doc, ensure_ascii=False, separators=(",", ":")))
+        else:
+            json.dump(doc, f, ensure_ascii=False, indent=indent)
+    return path, doc["op"]
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--out-dir", default="data")
+    parser.add_argument("--out-dir", default=str(ASSET_DIR))
+    parser.add_argument("--force", action="store_true",
+                        help="출력 파일이 스크립트보다 새로워도 다시 생성 "
+                             "(git checkout 뒤에는 mtime을 믿을 수 없으므로 필요)")
+    parser.add_argument("--indent", type=int, default=None,
+                        help="사람이 읽을 용도로 들여쓰기 (기본: 공백 없는 compact JSON)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="병렬 프로세스 수 (기본: CPU 수, 1이면 단일 프로세스로 디버깅)")
+    parser.add_argument("--pack-dotlottie", action="store_true",
+                        help="모든 장면을 <out-dir>/puppy.lottie (ZIP) 하나로 묶기")
     args = parser.parse_args()
     
     out = Path(args.out_dir)
     out.mkdir(parents=True, exist_ok=True)
+    src_mtime = Path(__file__).stat().st_mtime
     
-    scenes = [
-        ("puppy_idle.json",      90,  "idle"),
-        ("puppy_working.json",   60,  "working"),
-        ("puppy_alert.json",     45,  "alert"),
-        ("puppy_celebrate.json", 75,  "celebrate"),
-        ("Puppy sleeping.json",  120, "sleeping")
-    ]
-    
-    for fname, op, atype in scenes:
-        doc = make_dog_scene(fname, op, globals()[f"BG_{atype.upper()}"], atype)
+    # mtime 비교는 기본(compact) 출력끼리만 의미가 있다. --indent는 출력 형식이
+    # 달라지므로 최신 파일이라도 다시 쓴다.
+    skip_fresh = not args.force and args.indent is None
+    jobs = []
+    for fname, op, atype in SCENES:
         path = out / fname
-        path.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
-        print(f"[OK] {path}  ({doc['op']}프레임)")
+        if skip_fresh and path.exists() and path.stat().st_mtime > src_mtime:
+            print(f"[skip] {path}")
+            continue
+        jobs.append((fname, op, atype, path, args.indent))
+
+    if args.jobs == 1 or len(jobs) <= 1:
+        results = list(map(_build_one, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+            results = list(ex.map(_build_one, jobs))
+    for path, op in results:
+        print(f"[OK] {path}  ({op}프레임)")
+
+    if args.pack_dotlottie:
+        print(f"[OK] {pack_dotlottie(out, out / 'puppy.lottie')}")
 
     print("\n완료! 실행: python desktop-app/launch.py --lottie")
 
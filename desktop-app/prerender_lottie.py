@@ -3,39 +3,121 @@ Lottie JSON → 모든 프레임을 PNG 파일로 미리 렌더링하는 유틸
 Git Bash에서 rlottie-python이 segfault 나는 문제를 우회하기 위해
 별도 Python 프로세스(CMD/PowerShell)에서 실행.
 
+PNG는 zlib 레벨 1로 저장한다. 기본값(6)보다 인코딩이 수 배 빠르고 여전히
+무손실이지만 파일은 약 2배 커진다 (한 번 렌더링해 두고 읽기만 하므로 감수).
+
+입력은 Lottie JSON 또는 dotLottie 아카이브(.lottie)다. 아카이브는
+`puppy.lottie#idle` 처럼 애니메이션 id를 붙이며, 생략하면 첫 번째 애니메이션.
+
+--atlas를 주면 프레임을 격자 스프라이트시트 한 장(atlas.png)으로 합치고
+atlas.json 에 {"cols", "rows", "size", "count"} 를 기록한다.
+
 Usage:
-    python desktop-app/prerender_lottie.py <lottie.json> <output_dir> [size]
+    python desktop-app/prerender_lottie.py [--atlas] <lottie.json|file.lottie[#id]> <output_dir> [size] [workers]
 """
+import json
+import math
 import sys
 import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import freeze_support
 from pathlib import Path
 
-def prerender(json_path: str, output_dir: str, size: int = 160):
+def _load_animation(src: str):
+    """JSON 경로 또는 `archive.lottie[#id]` 에서 LottieAnimation을 연다."""
     import rlottie_python as rl
 
-    anim = rl.LottieAnimation.from_file(json_path)
-    total = anim.lottie_animation_get_totalframe()
-    os.makedirs(output_dir, exist_ok=True)
+    path, _, anim_id = src.partition("#")
+    if not path.lower().endswith(".lottie"):
+        return rl.LottieAnimation.from_file(path)
+    with zipfile.ZipFile(path) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        anim_id = anim_id or manifest["animations"][0]["id"]
+        data = zf.read(f"animations/{anim_id}.json").decode("utf-8")
+    return rl.LottieAnimation.from_data(data)
+
+def _render_range(json_path: str, output_dir: str, size: int, start: int, end: int,
+                  atlas: bool = False) -> list:
+    """[start, end) 프레임을 렌더링한다. 워커 프로세스마다 애니메이션을 따로 연다.
+    atlas=True면 PNG를 쓰지 않고 프레임별 RGBA 바이트 목록을 돌려준다."""
+    from PIL import Image
 
-    print(f"Rendering {total} frames at {size}x{size}...")
-    for i in range(total):
-        # render_pillow_frame에 크기 인자를 넘기면 Segfault 발생 → PIL resize 사용
+    anim = _load_animation(json_path)
+    frames = []
+    for i in range(start, end):
+        # render_pillow_frame에 크기 인자를 넘기면 Segfault 발생 → 원본 크기로 렌더링 후
+        # PIL resize. reducing_gap: 큰 축소는 정수배 reduce()로 먼저 줄인 뒤 리샘플링
         img = anim.render_pillow_frame(i)
         if img.size != (size, size):
-            img = img.resize((size, size))
+            img = img.resize((size, size), Image.Resampling.BILINEAR, reducing_gap=2.0)
+        if atlas:
+            frames.append(img.tobytes())
+            continue
         out = Path(output_dir) / f"frame_{i:04d}.png"
-        img.save(str(out), "PNG")
-        if i % 10 == 0:
-            print(f"  {i}/{total}", flush=True)
+        img.save(str(out), "PNG", compress_level=1, optimize=False)
+    return frames
+
+def _save_atlas(frames: list, output_dir: str, size: int) -> Path:
+    """프레임들을 정사각형에 가까운 격자 한 장(atlas.png)과 atlas.json 메타로 저장한다.
+    런타임은 파일 하나만 열고 (i % cols, i // cols) 칸을 잘라 쓰면 된다."""
+    from PIL import Image
+
+    count = len(frames)
+    cols = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / cols)
+    sheet = Image.new("RGBA", (size * cols, size * rows))
+    for i, raw in enumerate(frames):
+        frame = Image.frombytes("RGBA", (size, size), raw)
+        sheet.paste(frame, ((i % cols) * size, (i // cols) * size))
+    out = Path(output_dir) / "atlas.png"
+    sheet.save(str(out), "PNG", compress_level=1, optimize=False)
+    meta = {"cols": cols, "rows": rows, "size": size, "count": count}
+    (Path(output_dir) / "atlas.json").write_text(json.dumps(meta), encoding="utf-8")
+    return out
+
+def prerender(json_path: str, output_dir: str, size: int = 160, workers: int = None,
+              atlas: bool = False):
+    anim = _load_animation(json_path)
+    total = anim.lottie_animation_get_totalframe()
+    del anim
+    os.makedirs(output_dir, exist_ok=True)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, total))
+    print(f"Rendering {total} frames at {size}x{size} ({workers} workers)...")
+    frames = []
+    if workers == 1:
+        frames = _render_range(json_path, output_dir, size, 0, total, atlas)
+    else:
+        chunk = -(-total // workers)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [(min(start + chunk, total),
+                        ex.submit(_render_range, json_path, output_dir, size,
+                                  start, min(start + chunk, total), atlas))
+                       for start in range(0, total, chunk)]
+            for end, fut in futures:
+                frames.extend(fut.result())
+                print(f"  {end}/{total}", flush=True)
 
-    print(f"Done. {total} frames saved to {output_dir}")
+    if atlas:
+        print(f"Done. {total} frames packed into {_save_atlas(frames, output_dir, size)}")
+    else:
+        print(f"Done. {total} frames saved to {output_dir}")
     return total
 
 if __name__ == "__main__":
+    freeze_support()
+    # --atlas 플래그 처리 (위치 인자 파싱 전에 제거)
+    atlas = "--atlas" in sys.argv
+    if atlas:
+        sys.argv.remove("--atlas")
     if len(sys.argv) < 3:
-        print("Usage: prerender_lottie.py <lottie.json> <output_dir> [size]")
+        print("Usage: prerender_lottie.py [--atlas] <lottie.json|file.lottie[#id]> <output_dir> [size] [workers]")
+        print("  PNG는 빠른 저장을 위해 compress_level=1 (무손실, 파일 약 2배)")
+        print("  --atlas: 프레임별 PNG 대신 atlas.png 한 장 + atlas.json(cols/rows/size/count)")
         sys.exit(1)
     json_path = sys.argv[1]
     output_dir = sys.argv[2]
     size = int(sys.argv[3]) if len(sys.argv) > 3 else 160
-    prerender(json_path, output_dir, size)
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    prerender(json_path, output_dir, size, workers, atlas)
@@ -19,18 +19,30 @@ current working directory using the same watch_roots logic as project_mapper.
 from __future__ import annotations
 
 import argparse
+import functools
+import heapq
 import io
+import json
+import os
 import sqlite3
 import subprocess
 import sys
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import Optional
 
 # ---------------------------------------------------------------------------
 # Windows console UTF-8 (guard against double-wrapping)
 # ---------------------------------------------------------------------------
-if sys.platform == "win32":
+
+@functools.cache
+def _ensure_utf8_console() -> None:
+    """Wrap stdout/stderr as UTF-8 on Windows, once per process (no-op elsewhere)."""
+    if sys.platform != "win32":
+        return
     if hasattr(sys.stdout, "buffer") and not getattr(sys.stdout, "_daytracker_wrapped", False):
         sys.stdout = io.TextIOWrapper(
             sys.stdout.buffer, encoding="utf-8", errors="replace", line_buffering=True
@@ -42,6 +54,7 @@ if sys.platform == "win32":
         )
         sys.stderr._daytracker_wrapped = True  # type: ignore[attr-defined]
 
+
 # ---------------------------------------------------------------------------
 # Bootstrap sys.path
 # ---------------------------------------------------------------------------
@@ -65,9 +78,34 @@ except Exception:
 # Timestamp helpers
 # ---------------------------------------------------------------------------
 
+_UTC = timezone.utc
+
+
 def _parse_ts(ts_str: str) -> Optional[datetime]:
     if not ts_str:
         return None
+    # Fast path: the canonical UTC shape written by the collectors,
+    # "YYYY-MM-DDTHH:MM:SS[.ffffff]" followed by "Z" or "+00:00".
+    if ts_str[-1] == "Z":
+        body_len = len(ts_str) - 1
+    elif ts_str.endswith("+00:00"):
+        body_len = len(ts_str) - 6
+    else:
+        body_len = 0
+    if (
+        (body_len == 19 or (body_len == 26 and ts_str[19] == "."))
+        and ts_str[4] == "-" and ts_str[7] == "-" and ts_str[10] in "T "
+        and ts_str[13] == ":" and ts_str[16] == ":"
+    ):
+        try:
+            return datetime(
+                int(ts_str[0:4]), int(ts_str[5:7]), int(ts_str[8:10]),
+                int(ts_str[11:13]), int(ts_str[14:16]), int(ts_str[17:19]),
+                int(ts_str[20:26]) if body_len == 26 else 0,
+                tzinfo=_UTC,
+            )
+        except ValueError:
+            pass
     try:
         ts_str = ts_str.replace("Z", "+00:00")
         return datetime.fromisoformat(ts_str)
@@ -78,22 +116,114 @@ def _parse_ts(ts_str: str) -> Optional[datetime]:
 def _to_local(dt: Optional[datetime]) -> Optional[datetime]:
     if dt is None:
         return None
+    # No fixed tzinfo here: the local offset must be the one in effect at *dt*
+    # (DST), same as SQLite's 'localtime' modifier in _SQL_TS_LOCAL.
     return dt.astimezone()
 
 
-def _fmt_local(ts_str: str, fmt: str = "%Y-%m-%d %H:%M") -> str:
+_DEFAULT_FMT = "%Y-%m-%d %H:%M"
+
+
+@functools.lru_cache(maxsize=512)
+def _fmt_local_default(ts_str: str) -> str:
+    """Cached _fmt_local for the default format (the only one used here)."""
+    dt = _to_local(_parse_ts(ts_str))
+    if dt is None:
+        return ts_str
+    return dt.strftime(_DEFAULT_FMT)
+
+
+def _fmt_local(ts_str: str, fmt: str = _DEFAULT_FMT) -> str:
     """Convert UTC timestamp string to local time formatted string."""
+    if fmt == _DEFAULT_FMT:
+        return _fmt_local_default(ts_str)
     dt = _to_local(_parse_ts(ts_str))
     if dt is None:
         return ts_str
     return dt.strftime(fmt)
 
 
+# ---------------------------------------------------------------------------
+# SQL (module-level so sqlite3's statement cache hits on the same text)
+# ---------------------------------------------------------------------------
+
+_SQL_PROJECT_PATH = "SELECT path FROM projects WHERE name = ?"
+
+# Display form of an offset-qualified timestamp ("...Z" / "...+09:00"),
+# converted with SQLite's 'localtime' (process TZ, like datetime.astimezone).
+# NULL for naive or unparsable values; those fall back to _fmt_local().
+_SQL_TS_LOCAL = """
+    CASE WHEN length(timestamp) > 19
+              AND (substr(timestamp, -1) = 'Z' OR substr(timestamp, -6, 1) IN ('+', '-'))
+         THEN strftime('%Y-%m-%d %H:%M', timestamp, 'localtime')
+    END"""
+
+# One round-trip: resolve the project id, then take the newest `limit` AI
+# prompts (by id OR name) and the newest `limit` file events (by id), plus the
+# latest timestamp across both as a single 'm' row. An unknown project yields
+# id NULL, which leaves only the name match for prompts (on
+# idx_ai_prompts_project, see init_db) and no file events: the file_events
+# LIMIT drops to 0, so that branch ends before scanning anything.
+# Row shape: (src, timestamp, ts_local, tool, prompt_text, file_path, event_type)
+# Params: (project_name, project_name, limit, limit)
+_SQL_PROJECT_HISTORY = f"""
+    WITH p AS (SELECT id FROM projects WHERE name = ?),
+    a AS (
+        SELECT 'a' AS src, timestamp, {_SQL_TS_LOCAL} AS ts_local,
+               tool, prompt_text, NULL AS file_path, NULL AS event_type
+        FROM ai_prompts
+        WHERE project_id = (SELECT id FROM p) OR project = ?
+        ORDER BY timestamp DESC
+        LIMIT ?
+    ),
+    f AS (
+        SELECT 'f' AS src, timestamp, {_SQL_TS_LOCAL},
+               NULL, NULL, file_path, event_type
+        FROM file_events
+        WHERE project_id = (SELECT id FROM p)
+        ORDER BY timestamp DESC
+        LIMIT CASE WHEN (SELECT id FROM p) IS NULL THEN 0 ELSE ? END
+    )
+    SELECT * FROM a
+    UNION ALL
+    SELECT * FROM f
+    UNION ALL
+    SELECT 'm', MAX(timestamp), NULL, NULL, NULL, NULL, NULL
+    FROM (SELECT timestamp FROM a UNION ALL SELECT timestamp FROM f)
+"""
+
+
 # ---------------------------------------------------------------------------
 # Project detection
 # ---------------------------------------------------------------------------
 
-def detect_project(project_arg: Optional[str] = None) -> tuple[str, str]:
+def _norm_path_str(p: str | Path) -> str:
+    """Forward-slash path string without duplicate or trailing separators."""
+    return str(PurePosixPath(str(p).replace("\\", "/")))
+
+
+@functools.lru_cache(maxsize=8)
+def _watch_root_table(watch_roots: tuple[str, ...]) -> tuple[tuple[str, str, str], ...]:
+    """
+    Pre-normalized (root, prefix, prefix.lower()) triples for watch_roots,
+    where prefix is the root with exactly one trailing "/" ("/" itself for
+    the filesystem root, which already ends in one).
+
+    Config order is kept (not longest-first) so the first matching root
+    wins, exactly as in project_mapper.map_path_to_project.
+    """
+    table = []
+    for root_str in watch_roots:
+        root_norm = _norm_path_str(root_str)
+        prefix = root_norm if root_norm.endswith("/") else root_norm + "/"
+        table.append((root_norm, prefix, prefix.lower()))
+    return tuple(table)
+
+
+def detect_project(
+    project_arg: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None,
+) -> tuple[str, str]:
     """
     Detect the current project name and its filesystem path.
 
@@ -102,6 +232,8 @@ def detect_project(project_arg: Optional[str] = None) -> tuple[str, str]:
     project_arg : str | None
         If provided, look up this project name in the DB to get its path.
         If None, auto-detect from the current working directory.
+    conn : sqlite3.Connection | None
+        Already-open DB connection to reuse (see _open_db).
 
     Returns
     -------
@@ -122,33 +254,31 @@ def detect_project(project_arg: Optional[str] = None) -> tuple[str, str]:
     if project_arg:
         # Look up path from DB
         db_path = cfg.get_db_path()
-        project_path = _get_project_path_from_db(db_path, project_arg)
+        project_path = _get_project_path_from_db(db_path, project_arg, conn)
         return project_arg, (project_path or "")
 
-    # Auto-detect from cwd
+    # Auto-detect from cwd: one pass over watch_roots yields both the project
+    # name (first component under a root, as in project_mapper) and its path.
+    # No ancestor walk is needed -- an ancestor can only sit under a root
+    # that cwd itself is already under.
     cwd = Path.cwd()
-    try:
-        from scripts.processors.project_mapper import map_path_to_project  # type: ignore
-    except ImportError:
-        try:
-            from processors.project_mapper import map_path_to_project  # type: ignore
-        except ImportError:
-            print(
-                "[context_agent] ERROR: Could not import project_mapper.",
-                file=sys.stderr,
-            )
-            sys.exit(1)
-
-    watch_roots = cfg.watch_roots
-    project_name = map_path_to_project(str(cwd), watch_roots)
-
-    if not project_name:
-        # Try parent directories
-        for parent in cwd.parents:
-            project_name = map_path_to_project(str(parent), watch_roots)
-            if project_name:
-                cwd = parent
-                break
+    cwd_str = _norm_path_str(cwd)
+    cwd_lower = cwd_str.lower()
+    project_name = ""
+    project_path = ""
+    for root_norm, prefix, prefix_lower in _watch_root_table(tuple(cfg.watch_roots)):
+        if cwd_str == root_norm or cwd_str.startswith(prefix):
+            tail = cwd_str[len(prefix):].split("/", 1)[0]
+        elif cwd_lower == root_norm.lower() or cwd_lower.startswith(prefix_lower):
+            # Case-insensitive match (Windows drive letters, mixed-case roots)
+            tail = cwd_lower[len(prefix):].split("/", 1)[0]
+        else:
+            continue
+        if not project_path:
+            project_path = os.path.normpath(prefix + tail if tail else cwd_str)
+        if tail:
+            project_name = tail
+            break
 
     if not project_name:
         print(
@@ -158,55 +288,87 @@ def detect_project(project_arg: Optional[str] = None) -> tuple[str, str]:
         )
         sys.exit(1)
 
-    # Determine project root path
-    project_path = ""
-    for root_str in watch_roots:
-        root_p = Path(root_str.replace("\\", "/"))
-        try:
-            cwd_p = Path(str(cwd).replace("\\", "/"))
-            rel = cwd_p.relative_to(root_p)
-            project_path = str(root_p / rel.parts[0]) if rel.parts else str(cwd_p)
-            break
-        except ValueError:
-            # Try case-insensitive
-            try:
-                rel = Path(str(cwd_p).lower()).relative_to(Path(str(root_p).lower()))
-                project_path = str(root_p / rel.parts[0]) if rel.parts else str(cwd_p)
-                break
-            except ValueError:
-                continue
-
     return project_name, project_path
 
 
-def _get_project_path_from_db(db_path: str, project_name: str) -> Optional[str]:
+def _get_project_path_from_db(
+    db_path: str, project_name: str, conn: Optional[sqlite3.Connection] = None
+) -> Optional[str]:
     """Look up project path in the DB by name."""
-    if not Path(db_path).exists():
-        return None
+    own_conn = conn is None
     try:
-        with sqlite3.connect(db_path, timeout=10) as conn:
-            row = conn.execute(
-                "SELECT path FROM projects WHERE name = ?", (project_name,)
-            ).fetchone()
+        if own_conn:
+            conn = _open_db(db_path)
+            if conn is None:
+                return None
+        row = conn.execute(_SQL_PROJECT_PATH, (project_name,)).fetchone()
         return row[0] if row else None
     except Exception:  # noqa: BLE001
         return None
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
+
+
+# ---------------------------------------------------------------------------
+# DB connection
+# ---------------------------------------------------------------------------
+
+def _open_db(db_path: str) -> Optional[sqlite3.Connection]:
+    """
+    Open the worklog DB tuned for read-only use, or return None if missing.
+
+    run() opens one connection and passes it to every query helper.
+    """
+    if not Path(db_path).exists():
+        return None
+    conn = sqlite3.connect(db_path, timeout=10, cached_statements=32)
+    conn.execute("PRAGMA query_only = 1")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA cache_size = -20000")
+    return conn
 
 
 # ---------------------------------------------------------------------------
 # DB queries
 # ---------------------------------------------------------------------------
 
-def get_project_history(db_path: str, project_name: str, limit: int = 10) -> dict:
+def _prompt_preview(prompt_text: Optional[str], width: int = 80) -> str:
+    """
+    First *width* chars of the prompt on one line, "..." appended if longer.
+
+    Only a bounded head of a long prompt is copied; the full prompt is
+    scanned only when that head is mostly whitespace.
+    """
+    text = prompt_text or ""
+    if len(text) > 200:
+        head = text[:200].replace("\n", " ").strip()
+        if len(head) > width:
+            return head[:width] + "..."
+    prompt = text.replace("\n", " ").strip()
+    return prompt[:width] + ("..." if len(prompt) > width else "")
+
+
+def get_project_history(
+    db_path: str,
+    project_name: str,
+    limit: int = 10,
+    conn: Optional[sqlite3.Connection] = None,
+) -> dict:
     """
     Query all relevant history for a project.
 
+    Uses *conn* if given (see _open_db), otherwise opens and closes its own.
+
     Returns a dict with keys:
         project_name   - str
         last_active    - str (YYYY-MM-DD, local) or None
         ai_sessions    - list of dicts {timestamp_local, tool, prompt_preview}
         file_events    - list of dicts {timestamp_local, file_path, event_type}
     """
+    # One "now" for every relative-date computation in this call
+    now_local = datetime.now().astimezone()
     result: dict = {
         "project_name": project_name,
         "last_active": None,
@@ -214,104 +376,56 @@ def get_project_history(db_path: str, project_name: str, limit: int = 10) -> dic
         "file_events": [],
     }
 
-    if not Path(db_path).exists():
-        return result
-
+    own_conn = conn is None
     try:
-        with sqlite3.connect(db_path, timeout=10) as conn:
-            conn.row_factory = sqlite3.Row
-
-            # Get project_id
-            proj_row = conn.execute(
-                "SELECT id FROM projects WHERE name = ?", (project_name,)
-            ).fetchone()
-
-            proj_id: Optional[int] = proj_row["id"] if proj_row else None
-
-            # AI sessions: match by project_id OR project column name
-            if proj_id is not None:
-                ai_rows = conn.execute(
-                    """
-                    SELECT timestamp, tool, prompt_text, session_id
-                    FROM ai_prompts
-                    WHERE project_id = ? OR project = ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                    """,
-                    (proj_id, project_name, limit),
-                ).fetchall()
-            else:
-                ai_rows = conn.execute(
-                    """
-                    SELECT timestamp, tool, prompt_text, session_id
-                    FROM ai_prompts
-                    WHERE project = ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                    """,
-                    (project_name, limit),
-                ).fetchall()
-
-            sessions = []
-            for r in ai_rows:
-                prompt = (r["prompt_text"] or "").replace("\n", " ").strip()
-                preview = prompt[:80] + ("..." if len(prompt) > 80 else "")
+        if own_conn:
+            conn = _open_db(db_path)
+            if conn is None:
+                return result
+        rows = conn.execute(
+            _SQL_PROJECT_HISTORY,
+            (project_name, project_name, limit, limit),
+        ).fetchall()
+        # Rows are plain tuples (see _SQL_PROJECT_HISTORY); ts_local is
+        # already in display form unless the stored timestamp was naive.
+        sessions = []
+        file_events = []
+        latest_utc = None
+        for src, ts, ts_local, tool, prompt_text, fp, ev in rows:
+            if src == "a":
                 sessions.append({
-                    "timestamp_local": _fmt_local(r["timestamp"]),
-                    "tool": r["tool"] or "claude-code",
-                    "prompt_preview": preview,
+                    "timestamp_local": ts_local or _fmt_local(ts),
+                    "tool": tool or "claude-code",
+                    "prompt_preview": _prompt_preview(prompt_text),
                 })
-            result["ai_sessions"] = sessions
-
-            # File events: match by project_id
-            if proj_id is not None:
-                fe_rows = conn.execute(
-                    """
-                    SELECT timestamp, file_path, event_type
-                    FROM file_events
-                    WHERE project_id = ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                    """,
-                    (proj_id, limit),
-                ).fetchall()
-            else:
-                fe_rows = []
-
-            file_events = []
-            for r in fe_rows:
+            elif src == "f":
                 file_events.append({
-                    "timestamp_local": _fmt_local(r["timestamp"]),
-                    "file_path": r["file_path"] or "",
-                    "event_type": r["event_type"] or "modified",
+                    "timestamp_local": ts_local or _fmt_local(ts),
+                    "file_path": fp or "",
+                    "event_type": ev or "modified",
                 })
-            result["file_events"] = file_events
-
-            # Last active date: MAX of all timestamps for this project
-            all_ts: list[str] = []
-            for r in ai_rows:
-                if r["timestamp"]:
-                    all_ts.append(r["timestamp"])
-            for r in fe_rows:
-                if r["timestamp"]:
-                    all_ts.append(r["timestamp"])
-
-            if all_ts:
-                latest_utc = max(all_ts)
-                dt = _to_local(_parse_ts(latest_utc))
-                if dt:
-                    today = datetime.now().date()
-                    last_date = dt.date()
-                    diff = (today - last_date).days
-                    if diff == 0:
-                        result["last_active"] = f"{dt.strftime('%Y-%m-%d')} (today)"
-                    elif diff == 1:
-                        result["last_active"] = f"{dt.strftime('%Y-%m-%d')} (yesterday)"
-                    else:
-                        result["last_active"] = f"{dt.strftime('%Y-%m-%d')} ({diff} days ago)"
+            else:
+                latest_utc = ts
+        result["ai_sessions"] = sessions
+        result["file_events"] = file_events
+
+        # Last active date: MAX of all timestamps for this project
+        if latest_utc:
+            dt = _to_local(_parse_ts(latest_utc))
+            if dt:
+                diff = (now_local.date() - dt.date()).days
+                if diff == 0:
+                    result["last_active"] = f"{dt.strftime('%Y-%m-%d')} (today)"
+                elif diff == 1:
+                    result["last_active"] = f"{dt.strftime('%Y-%m-%d')} (yesterday)"
+                else:
+                    result["last_active"] = f"{dt.strftime('%Y-%m-%d')} ({diff} days ago)"
 
     except Exception as exc:  # noqa: BLE001
         print(f"[context_agent] WARNING: DB query failed: {exc}", file=sys.stderr)
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
 
     return result
 
@@ -320,15 +434,124 @@ def get_project_history(db_path: str, project_name: str, limit: int = 10) -> dic
 # Git log
 # ---------------------------------------------------------------------------
 
-def get_git_log(project_path: str, n: int = 5) -> list[str]:
+# Stored next to worklog.db: {"<project_path>|<n>": {"sha": ..., "lines": [...]}}
+_GITLOG_CACHE_NAME = ".context_agent_gitlog.json"
+
+
+def _git_dir(project_path: str) -> Optional[Path]:
+    """Return the .git directory for *project_path* (following worktree files)."""
+    dot_git = Path(project_path) / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        try:
+            content = dot_git.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            if not git_dir.is_absolute():
+                git_dir = Path(project_path) / git_dir
+            return git_dir if git_dir.is_dir() else None
+    return None
+
+
+def _read_head_sha(project_path: str) -> Optional[str]:
     """
-    Run `git log --oneline -N` on the project path.
+    Resolve HEAD to a commit sha by reading .git files directly (no subprocess).
 
-    Returns a list of commit line strings, or [] on error.
+    Returns None when the layout is not understood; callers then skip caching.
     """
-    if not project_path or not Path(project_path).exists():
-        return []
+    git_dir = _git_dir(project_path)
+    if git_dir is None:
+        return None
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if not head.startswith("ref:"):
+            return head or None  # detached HEAD
+        ref = head[len("ref:"):].strip()
+        # Worktrees keep their HEAD locally but share refs with the main repo
+        common = git_dir
+        if (git_dir / "commondir").is_file():
+            common = git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()
+        for base in (git_dir, common):
+            ref_file = base / ref
+            if ref_file.is_file():
+                return ref_file.read_text(encoding="utf-8").strip() or None
+        packed = common / "packed-refs"
+        if packed.is_file():
+            for line in packed.read_text(encoding="utf-8").splitlines():
+                if line.endswith(" " + ref) and not line.startswith(("#", "^")):
+                    return line.split(" ", 1)[0]
+    except OSError:
+        return None
+    return None
+
+
+def _read_git_log_fast(project_path: str, sha: str, n: int) -> Optional[list[str]]:
+    """
+    `git log --oneline -N` without spawning git, for loose-object repos.
 
+    Walks commits newest-first by committer date (git's default order),
+    inflating loose objects with zlib. Returns None as soon as something
+    is outside the common case (packed object, shallow clone, bad object)
+    so the caller can fall back to the git subprocess.
+    """
+    git_dir = _git_dir(project_path)
+    if git_dir is None:
+        return None
+    common = git_dir
+    try:
+        if (git_dir / "commondir").is_file():
+            common = git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()
+        if (common / "shallow").exists():
+            return None
+        objects = common / "objects"
+
+        def read_commit(commit_sha: str) -> Optional[tuple[int, list[str], str]]:
+            obj = objects / commit_sha[:2] / commit_sha[2:]
+            if not obj.is_file():
+                return None  # packed
+            raw = zlib.decompress(obj.read_bytes())
+            header, _, body = raw.partition(b"\0")
+            if not header.startswith(b"commit "):
+                return None
+            headers, _, message = body.partition(b"\n\n")
+            parents: list[str] = []
+            ctime = 0
+            for line in headers.split(b"\n"):
+                if line.startswith(b"parent "):
+                    parents.append(line[7:].decode("ascii"))
+                elif line.startswith(b"committer "):
+                    ctime = int(line.rsplit(b" ", 2)[-2])
+            # Subject = first paragraph folded onto one line, like --oneline
+            para = message.decode("utf-8", errors="replace").strip().split("\n\n", 1)[0]
+            subject = " ".join(part.strip() for part in para.splitlines())
+            return ctime, parents, subject
+
+        lines: list[str] = []
+        first = read_commit(sha)
+        if first is None:
+            return None
+        heap = [(-first[0], sha, first)]
+        seen = {sha}
+        while heap and len(lines) < n:
+            _, cur, (ctime, parents, subject) = heapq.heappop(heap)
+            lines.append(f"{cur[:7]} {subject}")
+            for parent in parents:
+                if parent in seen:
+                    continue
+                seen.add(parent)
+                info = read_commit(parent)
+                if info is None:
+                    return None
+                heapq.heappush(heap, (-info[0], parent, info))
+        return lines
+    except (OSError, ValueError, zlib.error):
+        return None
+
+
+def _run_git_log(project_path: str, n: int) -> list[str]:
     try:
         result = subprocess.run(
             ["git", "log", "--oneline", f"-{n}"],
@@ -348,10 +571,101 @@ def get_git_log(project_path: str, n: int = 5) -> list[str]:
         return []
 
 
+@functools.lru_cache(maxsize=32)
+def _git_log_for_head(
+    project_path: str, sha: str, n: int, cache_path: Optional[str]
+) -> tuple[str, ...]:
+    """git log for a known HEAD sha, backed by the on-disk JSON cache."""
+    key = f"{project_path}|{n}"
+    cache: dict = {}
+    if cache_path:
+        try:
+            cache = json.loads(Path(cache_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cache = {}
+        entry = cache.get(key)
+        if isinstance(entry, dict) and entry.get("sha") == sha:
+            return tuple(entry.get("lines", []))
+
+    lines = _read_git_log_fast(project_path, sha, n)
+    if lines is None:
+        lines = _run_git_log(project_path, n)
+    if cache_path and lines:
+        cache[key] = {"sha": sha, "lines": lines}
+        _write_gitlog_cache(cache_path, cache)
+    return tuple(lines)
+
+
+def _write_gitlog_cache(cache_path: str, cache: dict) -> None:
+    """
+    Replace the git log cache file atomically: write a temp file next to it
+    and os.replace() it over the old one, so a concurrent run never reads a
+    half-written file. Failures only cost the cache.
+    """
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=Path(cache_path).parent,
+            prefix=_GITLOG_CACHE_NAME, suffix=".tmp", delete=False,
+        ) as tmp:
+            tmp_path = tmp.name
+            json.dump(cache, tmp, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+        tmp_path = None
+    except OSError:
+        pass
+    finally:
+        if tmp_path:
+            try:
+                Path(tmp_path).unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
+def get_git_log(project_path: str, n: int = 5, cache_path: Optional[str] = None) -> list[str]:
+    """
+    Run `git log --oneline -N` on the project path.
+
+    Results are cached per (project_path, HEAD sha, n), in-process and, if
+    *cache_path* is given, in that JSON file, so `git` only runs when HEAD
+    has moved.
+
+    Returns a list of commit line strings, or [] on error.
+    """
+    if not project_path or not Path(project_path).exists():
+        return []
+
+    sha = _read_head_sha(project_path)
+    if sha is None:
+        return _run_git_log(project_path, n)
+    return list(_git_log_for_head(project_path, sha, n, cache_path))
+
+
 # ---------------------------------------------------------------------------
 # Context summary generator
 # ---------------------------------------------------------------------------
 
+# Separators Path(...).name splits on: "/" on POSIX, "/" and "\\" on Windows.
+_PATH_SEPS = os.sep + (os.altsep or "")
+
+
+def _basename(p: str) -> str:
+    """Path(p).name without building a Path (trailing separators ignored)."""
+    return os.path.basename(p.rstrip(_PATH_SEPS))
+
+
+# "+====+" / "|  Context: name  |" / "+====+" / blank line
+_HEADER_TMPL = "+{border}+\n|{title}|\n+{border}+\n\n"
+
+
+@functools.lru_cache(maxsize=64)
+def _context_header(project_name: str) -> str:
+    """Boxed title block for *project_name* (at least 54 columns wide)."""
+    title = f"  Context: {project_name}  "
+    width = max(len(title) + 4, 54)
+    return _HEADER_TMPL.format(border="=" * (width - 2), title=title.ljust(width - 2))
+
+
 def generate_context(data: dict) -> str:
     """
     Generate the context summary as a plain text string.
@@ -370,83 +684,75 @@ def generate_context(data: dict) -> str:
     file_events: list[dict] = data.get("file_events", [])
     git_commits: list[str] = data.get("git_commits", [])
 
-    lines: list[str] = []
+    buf = io.StringIO()
+    w = buf.write
 
     # ── Header ───────────────────────────────────────────────────────────────
-    title = f"  Context: {project_name}  "
-    width = max(len(title) + 4, 54)
-    border = "=" * (width - 2)
-    lines.append(f"+{border}+")
-    lines.append(f"|{title.ljust(width - 2)}|")
-    lines.append(f"+{border}+")
-    lines.append("")
+    w(_context_header(project_name))
 
     if project_path:
-        lines.append(f"Path: {project_path}")
-        lines.append("")
+        w(f"Path: {project_path}\n\n")
 
     # ── Last active ──────────────────────────────────────────────────────────
-    lines.append(f"[Last Active] {last_active or '(no records found)'}")
-    lines.append("")
+    w(f"[Last Active] {last_active or '(no records found)'}\n\n")
 
     # ── AI sessions ─────────────────────────────────────────────────────────
     n_ai = len(ai_sessions)
-    lines.append(f"[AI Sessions] Recent {n_ai} session(s)")
+    w(f"[AI Sessions] Recent {n_ai} session(s)\n")
     if ai_sessions:
         for sess in ai_sessions:
             ts = sess["timestamp_local"]
             tool = sess["tool"]
             preview = sess["prompt_preview"]
-            lines.append(f"  * {ts}  {tool}: {preview}")
+            w(f"  * {ts}  {tool}: {preview}\n")
     else:
-        lines.append("  (no AI sessions recorded for this project)")
-    lines.append("")
+        w("  (no AI sessions recorded for this project)\n")
+    w("\n")
 
     # ── File events ──────────────────────────────────────────────────────────
     n_files = len(file_events)
-    lines.append(f"[Recent Files] Last {n_files} modified file(s)")
+    w(f"[Recent Files] Last {n_files} modified file(s)\n")
     if file_events:
         for fe in file_events:
             ts = fe["timestamp_local"]
             fp = fe["file_path"]
             # Display just the filename for brevity, full path on next line
-            fp_name = Path(fp).name if fp else "?"
-            lines.append(f"  * {fp_name}  ({ts})")
+            fp_name = _basename(fp) if fp else "?"
+            w(f"  * {fp_name}  ({ts})\n")
             if fp and fp_name != fp:
-                lines.append(f"    {fp}")
+                w(f"    {fp}\n")
     else:
-        lines.append("  (no file events recorded for this project)")
-    lines.append("")
+        w("  (no file events recorded for this project)\n")
+    w("\n")
 
     # ── Git commits ──────────────────────────────────────────────────────────
-    lines.append(f"[Git Commits] Recent {len(git_commits)} commit(s)")
+    w(f"[Git Commits] Recent {len(git_commits)} commit(s)\n")
     if git_commits:
         for commit_line in git_commits:
-            lines.append(f"  * {commit_line}")
+            w(f"  * {commit_line}\n")
     else:
-        lines.append("  (no git log available)")
-    lines.append("")
+        w("  (no git log available)\n")
+    w("\n")
 
     # ── Suggested action ─────────────────────────────────────────────────────
-    lines.append("[Suggested] Pick up where you left off")
+    w("[Suggested] Pick up where you left off\n")
     if ai_sessions:
         last_ai = ai_sessions[0]
         preview = last_ai["prompt_preview"]
         short = preview[:60] + ("..." if len(preview) > 60 else "")
-        lines.append(f"  Last AI session: \"{short}\"")
+        w(f"  Last AI session: \"{short}\"\n")
         if git_commits:
-            lines.append(f"  Last commit: {git_commits[0]}")
-        lines.append("  -> Continue from this point?")
+            w(f"  Last commit: {git_commits[0]}\n")
+        w("  -> Continue from this point?\n")
     elif file_events:
         last_fe = file_events[0]
-        fp_name = Path(last_fe["file_path"]).name
-        lines.append(f"  Last file modified: {fp_name} ({last_fe['timestamp_local']})")
-        lines.append("  -> Continue from this point?")
+        fp_name = _basename(last_fe["file_path"])
+        w(f"  Last file modified: {fp_name} ({last_fe['timestamp_local']})\n")
+        w("  -> Continue from this point?\n")
     else:
-        lines.append("  (no previous context found; start fresh)")
-    lines.append("")
+        w("  (no previous context found; start fresh)\n")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 # ---------------------------------------------------------------------------
@@ -464,21 +770,36 @@ def run(project: Optional[str] = None, dry_run: bool = False) -> None:
     dry_run : bool
         If True, only print to stdout; do not write any files.
     """
+    _ensure_utf8_console()
     cfg = _cfg
     if cfg is None:
         print("[context_agent] ERROR: Could not load config.", file=sys.stderr)
         sys.exit(1)
 
     db_path = cfg.get_db_path()
+    _fmt_local_default.cache_clear()
 
-    # Detect project
-    project_name, project_path = detect_project(project)
-
-    # Query DB history
-    history = get_project_history(db_path, project_name, limit=10)
+    # One read-tuned connection shared by every query in this run
+    try:
+        conn = _open_db(db_path)
+    except sqlite3.Error as exc:
+        print(f"[context_agent] WARNING: could not open DB: {exc}", file=sys.stderr)
+        conn = None
 
-    # Git log
-    git_commits = get_git_log(project_path, n=5)
+    try:
+        # Detect project
+        project_name, project_path = detect_project(project, conn)
+
+        # Git log (subprocess / file IO) overlaps with the DB history query.
+        # A dry run writes no files, so it only uses the in-process cache.
+        gitlog_cache = None if dry_run else str(Path(db_path).parent / _GITLOG_CACHE_NAME)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            git_future = pool.submit(get_git_log, project_path, 5, gitlog_cache)
+            history = get_project_history(db_path, project_name, limit=10, conn=conn)
+            git_commits = git_future.result()
+    finally:
+        if conn is not None:
+            conn.close()
 
     # Assemble data dict
     data = {
@@ -503,6 +824,7 @@ def run(project: Optional[str] = None, dry_run: bool = False) -> None:
 # ---------------------------------------------------------------------------
 
 def main() -> None:
+    _ensure_utf8_console()
     parser = argparse.ArgumentParser(
         description=(
             "DayTracker Context Agent - show recent history for a project "
@@ -33,13 +33,15 @@ Sample output:
 from __future__ import annotations
 
 import argparse
+import functools
 import io
 import sqlite3
+import struct
 import sys
 from collections import defaultdict
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 # ---------------------------------------------------------------------------
 # Windows console UTF-8
@@ -79,27 +81,6 @@ except Exception:
 # Timestamp helpers
 # ---------------------------------------------------------------------------
 
-def _parse_ts(ts_str: str) -> Optional[datetime]:
-    if not ts_str:
-        return None
-    try:
-        ts_str = ts_str.replace("Z", "+00:00")
-        return datetime.fromisoformat(ts_str)
-    except (ValueError, AttributeError):
-        try:
-            return datetime.strptime(ts_str[:19], "%Y-%m-%dT%H:%M:%S").replace(
-                tzinfo=timezone.utc
-            )
-        except ValueError:
-            return None
-
-
-def _to_local(dt: Optional[datetime]) -> Optional[datetime]:
-    if dt is None:
-        return None
-    return dt.astimezone()
-
-
 def _utc_cutoff(days: int) -> str:
     """Return an ISO UTC timestamp for `days` ago."""
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
@@ -110,89 +91,511 @@ def _utc_cutoff(days: int) -> str:
 # DB queries
 # ---------------------------------------------------------------------------
 
-def _query_file_events(db_path: str, days: int) -> list[dict]:
-    """Fetch file_events from the last N days."""
-    db = Path(db_path)
-    if not db.exists():
-        return []
+def _open_conn(db_path: str) -> Optional[sqlite3.Connection]:
+    """
+    Open the worklog DB for the analysis queries, or return None if missing.
+
+    This is a read-only analytical path: the connection is query_only with a
+    64 MiB page cache, up to 1 GiB of mmap and in-memory temp storage (the
+    window/GROUP BY sorts). run() opens one connection and passes it to every
+    query helper so the page cache stays warm between scans.
+    """
+    if not Path(db_path).exists():
+        return None
+    conn = sqlite3.connect(db_path, timeout=5, cached_statements=32)
+    conn.execute("PRAGMA query_only = 1")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA mmap_size = 1073741824")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+# Batch size for streaming raw-row queries with cursor.fetchmany().
+# (The aggregate queries return at most 24 rows per day and are fetched whole.)
+_FETCH_BATCH = 4096
+
+# Local "YYYY-MM-DD HH:MM:SS" for file_events.timestamp, NULL if unparsable.
+# Offset-qualified values ("...Z", "...+09:00") are shifted by the :local_mod
+# modifier (see _local_modifier); naive ones are taken as local already,
+# matching datetime.astimezone().
+_SQL_LOCAL_TS = """CASE
+            WHEN length(timestamp) > 19
+                 AND (substr(timestamp, -1) = 'Z'
+                      OR substr(timestamp, -6, 1) IN ('+', '-'))
+            THEN datetime(timestamp, :local_mod)
+            ELSE datetime(timestamp)
+        END"""
+
+# Per local (day, hour) event counts for local days in [day_lo, day_hi].
+# Params: see _range_params
+_SQL_FILE_EVENT_BUCKETS = f"""
+    SELECT day, CAST(substr(lt, 12, 2) AS INTEGER) AS hour, COUNT(*) AS n
+    FROM (
+        SELECT lt, substr(lt, 1, 10) AS day
+        FROM (
+            SELECT {_SQL_LOCAL_TS} AS lt
+            FROM file_events
+            WHERE timestamp >= :ts_lo AND timestamp < :ts_hi
+        )
+    )
+    WHERE day BETWEEN :day_lo AND :day_hi
+    GROUP BY day, hour
+    ORDER BY day, hour
+"""
+
+# Project switches per local day in [day_lo, day_hi] (see _query_switch_counts).
+# Params: see _range_params
+_SQL_SWITCH_COUNTS = f"""
+    WITH ev AS (
+        SELECT substr(lt, 1, 10) AS d, ts, rid, pid
+        FROM (
+            SELECT {_SQL_LOCAL_TS} AS lt,
+                   timestamp AS ts, rowid AS rid, IFNULL(project_id, 0) AS pid
+            FROM file_events
+            WHERE timestamp >= :ts_lo AND timestamp < :ts_hi
+        )
+        WHERE substr(lt, 1, 10) BETWEEN :day_lo AND :day_hi
+    ),
+    seq AS (
+        SELECT d, pid, LAG(pid) OVER (PARTITION BY d ORDER BY ts, rid) AS prev
+        FROM ev
+    )
+    SELECT d, SUM(prev IS NOT NULL AND pid <> prev)
+    FROM seq
+    GROUP BY d
+    ORDER BY d
+"""
+
+# Params: (cutoff,)
+_SQL_ACTIVITY_LOG = """
+    SELECT al.timestamp, al.event_type, al.app_name, al.summary,
+           p.name AS project_name
+    FROM activity_log al
+    LEFT JOIN projects p ON al.project_id = p.id
+    WHERE al.timestamp >= ?
+    ORDER BY al.timestamp ASC
+"""
+
+# focus_daily (created by init_db): per local day rollup of the two queries
+# above for settled days (see _query_window). utc_offset is the local offset
+# (minutes) the day was bucketed with; rows computed under another timezone
+# are recomputed. (n_events, max_rowid) is the day's file_events fingerprint
+# (see _day_fingerprints) at the time it was rolled up.
+_SQL_LOAD_FOCUS_DAILY = """
+    SELECT day, utc_offset, hour_counts, switches, n_events, max_rowid
+    FROM focus_daily
+    WHERE day BETWEEN ? AND ?
+"""
+_SQL_STORE_FOCUS_DAILY = """
+    INSERT OR REPLACE INTO focus_daily
+        (day, utc_offset, hour_counts, switches, n_events, max_rowid)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SQL_CLEAR_FOCUS_DAILY = "DELETE FROM focus_daily"
+# Event count and newest rowid per stored date prefix (no local-time
+# conversion, so a plain covering scan of idx_file_timestamp; rowid is in
+# every index). See _day_fingerprints. Params: see _range_params
+_SQL_RAW_DAY_FINGERPRINTS = """
+    SELECT substr(timestamp, 1, 10) AS raw_day, COUNT(*), MAX(rowid)
+    FROM file_events
+    WHERE timestamp >= :ts_lo AND timestamp < :ts_hi
+    GROUP BY raw_day
+"""
+
+def _local_modifier(days: int) -> str:
+    """
+    SQLite date modifier converting UTC to local time over the last N days.
+
+    If the local UTC offset is the same at every day boundary in the window
+    (no DST change), return a fixed "+540 minutes"-style shift, which is a
+    plain addition per row; otherwise fall back to 'localtime', which asks the
+    C library for the offset in effect at each row.
+    """
+    now = datetime.now(timezone.utc)
+    offset = now.astimezone().utcoffset()
+    for d in range(1, days + 1):
+        if (now - timedelta(days=d)).astimezone().utcoffset() != offset:
+            return "localtime"
+    seconds = int(offset.total_seconds())
+    if seconds % 60:
+        return "localtime"
+    return f"{seconds // 60:+d} minutes"
+
+
+def _range_params(
+    days: int, day_lo: Optional[date] = None, day_hi: Optional[date] = None
+) -> dict:
+    """
+    Bind parameters for the bucket / switch queries: events from the last N
+    days whose local day lies in [day_lo, day_hi] (None = unbounded).
+
+    The timestamp bounds let SQLite narrow the scan on idx_file_timestamp.
+    Stored strings are in assorted offsets, so a local day's events can sit
+    up to ~26 hours either side of it textually; 2 days below and 3 above
+    the day range is always wide enough, and the day filter does the rest.
+    """
     cutoff = _utc_cutoff(days)
+    ts_lo = cutoff
+    if day_lo is not None:
+        ts_lo = max(cutoff, (day_lo - timedelta(days=2)).isoformat())
+    return {
+        "ts_lo": ts_lo,
+        "ts_hi": (day_hi + timedelta(days=3)).isoformat() if day_hi else "9999",
+        "day_lo": day_lo.isoformat() if day_lo else "0000",
+        "day_hi": day_hi.isoformat() if day_hi else "9999",
+        "local_mod": _local_modifier(days),
+    }
+
+
+def _query_file_event_buckets(
+    db_path: str,
+    days: int,
+    conn: Optional[sqlite3.Connection] = None,
+    day_lo: Optional[date] = None,
+    day_hi: Optional[date] = None,
+) -> list[tuple]:
+    """
+    Count file_events from the last N days per local (day, hour), in SQLite.
+
+    Returns plain (day, hour, count) tuples ordered by day and hour, limited
+    to local days in [day_lo, day_hi] when given. Day and hour are sliced
+    straight out of the local "YYYY-MM-DD HH:MM:SS" string rather than
+    re-parsed by strftime; the weekday is derived per distinct day in
+    _analyze_all. Timestamps SQLite cannot parse (see _SQL_LOCAL_TS) are
+    skipped.
+
+    Uses *conn* if given (see _open_conn), otherwise opens and closes its own.
+    """
+    own_conn = conn is None
     try:
-        with sqlite3.connect(str(db), timeout=5) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                """
-                SELECT fe.timestamp, fe.file_path, fe.event_type,
-                       p.name AS project_name
-                FROM file_events fe
-                LEFT JOIN projects p ON fe.project_id = p.id
-                WHERE fe.timestamp >= ?
-                ORDER BY fe.timestamp ASC
-                """,
-                (cutoff,),
-            ).fetchall()
-        return [dict(r) for r in rows]
+        if own_conn:
+            conn = _open_conn(db_path)
+            if conn is None:
+                return []
+        return conn.execute(
+            _SQL_FILE_EVENT_BUCKETS, _range_params(days, day_lo, day_hi)
+        ).fetchall()
     except sqlite3.Error as exc:
-        print(f"[focus_agent] DB error (file_events): {exc}", file=sys.stderr)
+        print(f"[focus_agent] DB error (file_events buckets): {exc}", file=sys.stderr)
         return []
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
 
 
-def _query_activity_log(db_path: str, days: int) -> list[dict]:
-    """Fetch activity_log rows from the last N days."""
-    db = Path(db_path)
-    if not db.exists():
-        return []
+def _query_switch_counts(
+    db_path: str,
+    days: int,
+    conn: Optional[sqlite3.Connection] = None,
+    day_lo: Optional[date] = None,
+    day_hi: Optional[date] = None,
+) -> dict[str, int]:
+    """
+    Count project switches per local day over the last N days, in SQLite.
+
+    Events are ordered by timestamp within each day and LAG() compares each
+    event's project_id with the previous one, so no join on projects is
+    needed. Events without a project share id 0; unparsable timestamps are
+    skipped. *day_lo* / *day_hi* limit the local days as in
+    _query_file_event_buckets.
+
+    Uses *conn* if given (see _open_conn), otherwise opens and closes its own.
+    """
+    own_conn = conn is None
+    try:
+        if own_conn:
+            conn = _open_conn(db_path)
+            if conn is None:
+                return {}
+        return dict(conn.execute(
+            _SQL_SWITCH_COUNTS, _range_params(days, day_lo, day_hi)
+        ))
+    except sqlite3.Error as exc:
+        print(f"[focus_agent] DB error (file_events switches): {exc}", file=sys.stderr)
+        return {}
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
+
+
+# focus_daily.hour_counts: 24 little-endian uint32 event counts, hour 0..23.
+_HOUR_COUNTS = struct.Struct("<24I")
+
+
+def _day_offset(day: date) -> int:
+    """Local UTC offset in minutes at noon of *day* (focus_daily.utc_offset)."""
+    noon = datetime(day.year, day.month, day.day, 12).astimezone()
+    return int(noon.utcoffset().total_seconds()) // 60
+
+
+def _day_fingerprints(
+    conn: sqlite3.Connection, days: int, day_lo: date, day_hi: date
+) -> dict[str, tuple[int, int]]:
+    """
+    (event count, newest rowid) per local day in [day_lo, day_hi].
+
+    A local day's events are stored with a date prefix of that day or the
+    day either side (UTC offsets stay within a day), so the fingerprint of
+    day D sums the counts and takes the newest rowid of prefixes D-1..D+1.
+    Any insert, delete or timestamp change on D alters it: rows added onto
+    an old day (e.g. the git hook stamps commits with their author date, so
+    an amend or cherry-pick lands on an old day), removed from it, or moved
+    onto or off it. Changes on neighbouring days also alter it, which only
+    costs a recompute.
+    """
+    raw = {
+        day: (n, rid) for day, n, rid in conn.execute(
+            _SQL_RAW_DAY_FINGERPRINTS, _range_params(days, day_lo, day_hi)
+        )
+    }
+    fingerprints: dict[str, tuple[int, int]] = {}
+    d = day_lo
+    while d <= day_hi:
+        near = [raw.get((d + timedelta(days=k)).isoformat(), (0, 0)) for k in (-1, 0, 1)]
+        fingerprints[d.isoformat()] = (
+            sum(n for n, _ in near), max(rid for _, rid in near)
+        )
+        d += timedelta(days=1)
+    return fingerprints
+
+
+def _load_focus_daily(
+    conn: sqlite3.Connection,
+    day_lo: date,
+    day_hi: date,
+    fingerprints: dict[str, tuple[int, int]],
+) -> Optional[dict[str, tuple[tuple[int, ...], int]]]:
+    """
+    Read focus_daily rows for [day_lo, day_hi] as day -> (hour_counts,
+    switches), dropping rows bucketed under a different UTC offset and rows
+    whose fingerprint no longer matches *fingerprints* (see
+    _day_fingerprints). Returns None if focus_daily is missing or outdated
+    (init_db.py not rerun).
+    """
+    offsets: dict[str, int] = {}
+    d = day_lo
+    while d <= day_hi:
+        offsets[d.isoformat()] = _day_offset(d)
+        d += timedelta(days=1)
+    try:
+        rows = conn.execute(
+            _SQL_LOAD_FOCUS_DAILY, (day_lo.isoformat(), day_hi.isoformat())
+        ).fetchall()
+    except sqlite3.Error:
+        return None
+    return {
+        day: (_HOUR_COUNTS.unpack(blob), switches)
+        for day, utc_offset, blob, switches, n_events, max_rowid in rows
+        if offsets.get(day) == utc_offset
+        and fingerprints.get(day) == (n_events, max_rowid)
+    }
+
+
+def _write_focus_daily(conn: sqlite3.Connection, sql: str, rows=None) -> None:
+    """
+    Run a write on focus_daily (executemany if *rows* is given). The analysis
+    connection is query_only, so writes are re-enabled just for this;
+    failures (e.g. the watcher holding the write lock) only cost the rollup,
+    not the report.
+    """
+    try:
+        conn.execute("PRAGMA query_only = 0")
+        with conn:
+            if rows is None:
+                conn.execute(sql)
+            else:
+                conn.executemany(sql, rows)
+    except sqlite3.Error as exc:
+        print(f"[focus_agent] focus_daily not updated: {exc}", file=sys.stderr)
+    finally:
+        conn.execute("PRAGMA query_only = 1")
+
+
+def _store_focus_daily(
+    conn: sqlite3.Connection,
+    daily: dict[str, tuple[tuple[int, ...], int]],
+    fingerprints: dict[str, tuple[int, int]],
+) -> None:
+    """Write freshly computed days into focus_daily with their fingerprints."""
+    rows = [
+        (day, _day_offset(date.fromisoformat(day)), _HOUR_COUNTS.pack(*counts),
+         switches, *fingerprints[day])
+        for day, (counts, switches) in daily.items()
+    ]
+    _write_focus_daily(conn, _SQL_STORE_FOCUS_DAILY, rows)
+
+
+def _query_window(
+    db_path: str, days: int, conn: Optional[sqlite3.Connection]
+) -> tuple[list[tuple], dict[str, int]]:
+    """
+    Buckets and per-day switch counts for the last N days (the inputs of
+    _analyze_all), reading settled days from the focus_daily rollup.
+
+    Settled days are those at least 3 days after the cutoff's local day
+    (every event on them is inside the window) and at least 2 days old.
+    Missing settled days are computed once and stored; a stored day is
+    recomputed if its fingerprint changed since (see _day_fingerprints).
+    The partial first days and the last two days are always queried live. Returns the same shapes as
+    _query_file_event_buckets and _query_switch_counts; empty if *conn* is
+    None (DB missing).
+    """
+    if conn is None:
+        return [], {}
+    cutoff_day = (datetime.now(timezone.utc) - timedelta(days=days)).astimezone().date()
+    settled_lo = cutoff_day + timedelta(days=3)
+    settled_hi = date.today() - timedelta(days=2)
+    if settled_lo > settled_hi:
+        return (
+            _query_file_event_buckets(db_path, days, conn),
+            _query_switch_counts(db_path, days, conn),
+        )
+
+    try:
+        # Read before any day is computed, so changes made meanwhile are
+        # caught next run rather than missed
+        fingerprints = _day_fingerprints(conn, days, settled_lo, settled_hi)
+    except sqlite3.Error as exc:
+        print(f"[focus_agent] DB error (focus_daily): {exc}", file=sys.stderr)
+        return (
+            _query_file_event_buckets(db_path, days, conn),
+            _query_switch_counts(db_path, days, conn),
+        )
+    daily = _load_focus_daily(conn, settled_lo, settled_hi, fingerprints)
+    if daily is None:
+        # No usable rollup table: query the whole window live
+        return (
+            _query_file_event_buckets(db_path, days, conn),
+            _query_switch_counts(db_path, days, conn),
+        )
+    missing = []
+    fresh: dict[str, tuple[list[int], int]] = {}
+    d = settled_lo
+    while d <= settled_hi:
+        if d.isoformat() not in daily:
+            missing.append(d)
+        d += timedelta(days=1)
+    if missing:
+        lo, hi = missing[0], missing[-1]
+        params = _range_params(days, lo, hi)
+        try:
+            bucket_rows = conn.execute(_SQL_FILE_EVENT_BUCKETS, params).fetchall()
+            switch_rows = conn.execute(_SQL_SWITCH_COUNTS, params).fetchall()
+        except sqlite3.Error as exc:
+            print(f"[focus_agent] DB error (focus_daily): {exc}", file=sys.stderr)
+            return (
+                _query_file_event_buckets(db_path, days, conn),
+                _query_switch_counts(db_path, days, conn),
+            )
+        d = lo
+        while d <= hi:
+            fresh[d.isoformat()] = ([0] * 24, 0)
+            d += timedelta(days=1)
+        for day, hour, n in bucket_rows:
+            fresh[day][0][hour] = n
+        for day, switches in switch_rows:
+            fresh[day] = (fresh[day][0], switches)
+        daily.update(fresh)
+    if fresh:
+        _store_focus_daily(conn, fresh, fingerprints)
+
+    before = settled_lo - timedelta(days=1)
+    after = settled_hi + timedelta(days=1)
+    buckets = _query_file_event_buckets(db_path, days, conn, None, before)
+    switch_counts = _query_switch_counts(db_path, days, conn, None, before)
+    for day in sorted(daily):
+        counts, switches = daily[day]
+        if any(counts):
+            buckets.extend((day, hour, n) for hour, n in enumerate(counts) if n)
+            switch_counts[day] = switches
+    buckets += _query_file_event_buckets(db_path, days, conn, after)
+    switch_counts.update(_query_switch_counts(db_path, days, conn, after))
+    return buckets, switch_counts
+
+
+def _query_activity_log(
+    db_path: str, days: int, conn: Optional[sqlite3.Connection] = None
+) -> Iterator[tuple]:
+    """
+    Stream activity_log rows from the last N days as plain tuples:
+    (timestamp, event_type, app_name, summary, project_name).
+
+    Rows are fetched in batches of _FETCH_BATCH while the connection stays
+    open, so a long range never sits in memory as one list. Uses *conn* if
+    given (see _open_conn), otherwise opens and closes its own.
+    """
     cutoff = _utc_cutoff(days)
+    own_conn = conn is None
     try:
-        with sqlite3.connect(str(db), timeout=5) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                """
-                SELECT al.timestamp, al.event_type, al.app_name, al.summary,
-                       p.name AS project_name
-                FROM activity_log al
-                LEFT JOIN projects p ON al.project_id = p.id
-                WHERE al.timestamp >= ?
-                ORDER BY al.timestamp ASC
-                """,
-                (cutoff,),
-            ).fetchall()
-        return [dict(r) for r in rows]
+        if own_conn:
+            conn = _open_conn(db_path)
+            if conn is None:
+                return
+        cur = conn.execute(_SQL_ACTIVITY_LOG, (cutoff,))
+        while batch := cur.fetchmany(_FETCH_BATCH):
+            yield from batch
     except sqlite3.Error as exc:
         print(f"[focus_agent] DB error (activity_log): {exc}", file=sys.stderr)
-        return []
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
 
 
 # ---------------------------------------------------------------------------
 # Analysis functions
 # ---------------------------------------------------------------------------
 
-def _analyze_peak_hours(file_rows: list[dict]) -> dict:
+_DAYS_KR = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+
+
+def _analyze_all(
+    buckets: list[tuple],
+    day_switch_counts: dict[str, int],
+) -> tuple[dict, dict, dict]:
     """
-    Find peak productive hours by counting file events per hour.
+    Produce all three analyses from the SQL aggregates.
+
+    *buckets* come from _query_file_event_buckets (per local day/hour counts)
+    and feed peak hours and day-of-week; *day_switch_counts* come from
+    _query_switch_counts.
 
     Returns
     -------
-    dict with keys:
-        hour_counts (dict hour(int) -> count),
-        peak_hour_start (int or None),
-        peak_two_hour_block (str or None),   e.g. "21:00-23:00"
-        peak_percentage (float),
-        avg_work_start_hour (float or None),
+    (peak_hours, dow_analysis, context_switches) dicts.
     """
-    hour_counts: dict[int, int] = defaultdict(int)
+    hour_counts = [0] * 24
     active_days: dict[str, int] = defaultdict(lambda: 25)  # day -> earliest hour
-
-    for row in file_rows:
-        dt = _to_local(_parse_ts(row.get("timestamp", "")))
-        if dt is None:
-            continue
-        hour = dt.hour
-        hour_counts[hour] += 1
-        day_str = dt.strftime("%Y-%m-%d")
+    dow_counts = [0] * 7  # 0=Monday
+    dow_order: list[int] = []  # weekdays in order of first appearance (tie-break)
+    dow_rank = [7] * 7  # weekday -> index in dow_order
+    best_dow, best_dow_count = -1, -1  # running max of dow_counts
+    weekday_of: dict[str, int] = {}  # day -> weekday, computed once per day
+    for day_str, hour, n in buckets:
+        hour_counts[hour] += n
         if hour < active_days[day_str]:
             active_days[day_str] = hour
+        weekday = weekday_of.get(day_str)
+        if weekday is None:
+            weekday = weekday_of[day_str] = date.fromisoformat(day_str).weekday()
+            if not dow_counts[weekday]:
+                dow_rank[weekday] = len(dow_order)
+                dow_order.append(weekday)
+        count = dow_counts[weekday] = dow_counts[weekday] + n
+        if count > best_dow_count or (
+            count == best_dow_count and dow_rank[weekday] < dow_rank[best_dow]
+        ):
+            best_dow, best_dow_count = weekday, count
+
+    return (
+        _summarize_peak_hours(hour_counts, active_days),
+        _summarize_day_of_week(dow_counts, dow_order, best_dow if dow_order else None),
+        _summarize_context_switches(day_switch_counts),
+    )
 
-    if not hour_counts:
+
+def _summarize_peak_hours(hour_counts: list[int], active_days: dict[str, int]) -> dict:
+    total_events = sum(hour_counts)
+    if not total_events:
         return {
             "hour_counts": {},
             "peak_hour_start": None,
@@ -201,16 +604,9 @@ def _analyze_peak_hours(file_rows: list[dict]) -> dict:
             "avg_work_start_hour": None,
         }
 
-    total_events = sum(hour_counts.values())
-
-    # Find the best 2-hour contiguous block
-    best_block_start = 0
-    best_block_count = 0
-    for h in range(24):
-        block_count = hour_counts.get(h, 0) + hour_counts.get((h + 1) % 24, 0)
-        if block_count > best_block_count:
-            best_block_count = block_count
-            best_block_start = h
+    # Find the best 2-hour contiguous block (earliest start wins ties)
+    best_block_start = max(range(24), key=lambda h: hour_counts[h] + hour_counts[(h + 1) % 24])
+    best_block_count = hour_counts[best_block_start] + hour_counts[(best_block_start + 1) % 24]
 
     peak_two_hour = (
         f"{best_block_start:02d}:00-{(best_block_start + 2) % 24:02d}:00"
@@ -224,7 +620,7 @@ def _analyze_peak_hours(file_rows: list[dict]) -> dict:
     avg_work_start = sum(start_hours) / len(start_hours) if start_hours else None
 
     return {
-        "hour_counts": dict(hour_counts),
+        "hour_counts": {h: c for h, c in enumerate(hour_counts) if c},
         "peak_hour_start": best_block_start,
         "peak_two_hour_block": peak_two_hour,
         "peak_percentage": round(peak_percentage, 1),
@@ -232,89 +628,34 @@ def _analyze_peak_hours(file_rows: list[dict]) -> dict:
     }
 
 
-def _analyze_day_of_week(file_rows: list[dict]) -> dict:
-    """
-    Analyze productivity by day of week.
-
-    Returns
-    -------
-    dict with keys:
-        dow_counts (dict weekday_index -> count, 0=Monday),
-        total_events (int),
-        dow_percentages (dict weekday_index -> float),
-        most_productive_dow (int or None),
-    """
-    DAYS_KR = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
-
-    dow_counts: dict[int, int] = defaultdict(int)
-    for row in file_rows:
-        dt = _to_local(_parse_ts(row.get("timestamp", "")))
-        if dt is None:
-            continue
-        dow_counts[dt.weekday()] += 1
-
-    total = sum(dow_counts.values())
+def _summarize_day_of_week(
+    dow_counts: list[int], dow_order: list[int], most_productive_dow: Optional[int]
+) -> dict:
+    total = sum(dow_counts)
     dow_percentages: dict[int, float] = {}
     if total > 0:
-        for dow, count in dow_counts.items():
-            dow_percentages[dow] = round(count / total * 100, 1)
-
-    most_productive_dow: Optional[int] = None
-    if dow_counts:
-        most_productive_dow = max(dow_counts, key=lambda d: dow_counts[d])
+        for dow in dow_order:
+            dow_percentages[dow] = round(dow_counts[dow] / total * 100, 1)
 
     return {
-        "dow_counts": dict(dow_counts),
+        "dow_counts": {dow: dow_counts[dow] for dow in dow_order},
         "total_events": total,
         "dow_percentages": dow_percentages,
         "most_productive_dow": most_productive_dow,
-        "day_labels": DAYS_KR,
+        "day_labels": _DAYS_KR,
     }
 
 
-def _analyze_context_switches(file_rows: list[dict], days: int) -> dict:
-    """
-    Detect context switches: how often the user switched between projects per day.
-
-    A "switch" occurs when consecutive file events belong to different projects.
-
-    Returns
-    -------
-    dict with keys:
-        day_switch_counts (dict date_str -> int),
-        avg_switches_per_day (float),
-        max_switch_day (str or None),
-        max_switch_count (int),
-    """
-    # Group events by day, then count project switches in sequence
-    day_events: dict[str, list[str]] = defaultdict(list)
-
-    for row in file_rows:
-        dt = _to_local(_parse_ts(row.get("timestamp", "")))
-        if dt is None:
-            continue
-        proj = (row.get("project_name") or "unknown").strip() or "unknown"
-        day_str = dt.strftime("%Y-%m-%d")
-        day_events[day_str].append(proj)
-
-    day_switch_counts: dict[str, int] = {}
-    for day_str, projects in day_events.items():
-        switches = 0
-        prev = None
-        for proj in projects:
-            if prev is not None and proj != prev:
-                switches += 1
-            prev = proj
-        day_switch_counts[day_str] = switches
-
-    if day_switch_counts:
-        avg_switches = sum(day_switch_counts.values()) / len(day_switch_counts)
-        max_switch_day = max(day_switch_counts, key=lambda d: day_switch_counts[d])
-        max_switch_count = day_switch_counts[max_switch_day]
-    else:
-        avg_switches = 0.0
-        max_switch_day = None
-        max_switch_count = 0
+def _summarize_context_switches(day_switch_counts: dict[str, int]) -> dict:
+    # One pass for both the total and the (earliest) busiest day
+    total_switches = 0
+    max_switch_day: Optional[str] = None
+    max_switch_count = 0
+    for day, switches in day_switch_counts.items():
+        total_switches += switches
+        if max_switch_day is None or switches > max_switch_count:
+            max_switch_day, max_switch_count = day, switches
+    avg_switches = total_switches / len(day_switch_counts) if day_switch_counts else 0.0
 
     return {
         "day_switch_counts": day_switch_counts,
@@ -328,9 +669,13 @@ def _analyze_context_switches(file_rows: list[dict], days: int) -> dict:
 # Report renderer
 # ---------------------------------------------------------------------------
 
-def _bar(percentage: float, bar_width: int = 8) -> str:
-    """Render a simple ASCII bar for a percentage."""
-    filled = int(round(percentage / 100 * bar_width))
+@functools.lru_cache(maxsize=256)
+def _bar(percentage_tenths: int, bar_width: int = 8) -> str:
+    """
+    Render a simple ASCII bar for a percentage given in integer tenths
+    (e.g. 45.3% -> 453), so that repeated percentages hit the cache.
+    """
+    filled = round(percentage_tenths * bar_width / 1000)
     return "#" * filled + " " * (bar_width - filled)
 
 
@@ -343,85 +688,80 @@ def _format_hour(h: Optional[float]) -> str:
     return f"{hour_int:02d}:{minute_int:02d}"
 
 
-def generate_focus_report(
+def _iter_report_lines(
     days: int,
     peak_hours: dict,
     dow_analysis: dict,
     context_switches: dict,
-) -> str:
-    """Build the formatted focus analysis report."""
+) -> Iterator[str]:
+    """Yield the lines of the focus analysis report (see generate_focus_report)."""
     title = f"Focus Analysis (최근 {days}일)"
     box_width = max(len(title) + 6, 48)
     border = "+" + "-" * (box_width - 2) + "+"
-    title_line = "|  " + title + " " * (box_width - 4 - len(title)) + "|"
-
-    lines = [
-        border,
-        title_line,
-        border,
-        "",
-    ]
+    yield border
+    yield f"|  {title:<{box_width - 4}}|"
+    yield border
+    yield ""
 
     # Peak hours section
-    lines.append("집중 시간대")
+    yield "집중 시간대"
     peak_block = peak_hours.get("peak_two_hour_block")
     peak_pct = peak_hours.get("peak_percentage", 0.0)
     if peak_block:
-        lines.append(f"  최고 생산성: {peak_block} (파일 변경 {peak_pct}%)")
+        yield f"  최고 생산성: {peak_block} (파일 변경 {peak_pct}%)"
     else:
-        lines.append("  최고 생산성: (데이터 없음)")
-
-    avg_start = peak_hours.get("avg_work_start_hour")
-    lines.append(f"  평균 작업 시작: {_format_hour(avg_start)}")
-    lines.append("")
+        yield "  최고 생산성: (데이터 없음)"
+    yield f"  평균 작업 시작: {_format_hour(peak_hours.get('avg_work_start_hour'))}"
+    yield ""
 
     # Day-of-week section
     DAYS_KR = dow_analysis.get("day_labels", [
         "월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"
     ])
-    lines.append("요일별 생산성")
+    yield "요일별 생산성"
     dow_percentages = dow_analysis.get("dow_percentages", {})
 
     if dow_percentages:
         # Show top 3 days + "기타" catch-all
         sorted_days = sorted(dow_percentages.items(), key=lambda x: x[1], reverse=True)
-        shown_count = 0
-        others_pct = 0.0
-        for dow, pct in sorted_days:
-            if shown_count < 3:
-                bar = _bar(pct)
-                label = DAYS_KR[dow] if dow < len(DAYS_KR) else f"Day{dow}"
-                lines.append(f"  {label:<6} {bar}  {pct:.0f}%")
-                shown_count += 1
-            else:
-                others_pct += pct
+        for dow, pct in sorted_days[:3]:
+            label = DAYS_KR[dow] if dow < len(DAYS_KR) else f"Day{dow}"
+            yield f"  {label:<6} {_bar(round(pct * 10))}  {pct:.0f}%"
+        others_pct = sum(pct for _, pct in sorted_days[3:])
         if others_pct > 0:
-            bar = _bar(others_pct)
-            lines.append(f"  기타     {bar}  {others_pct:.0f}%")
+            yield f"  기타     {_bar(round(others_pct * 10))}  {others_pct:.0f}%"
     else:
-        lines.append("  (데이터 없음)")
-    lines.append("")
+        yield "  (데이터 없음)"
+    yield ""
 
     # Context switch section
-    lines.append("컨텍스트 전환")
+    yield "컨텍스트 전환"
     avg_switches = context_switches.get("avg_switches_per_day", 0.0)
-    lines.append(f"  평균 프로젝트 전환: {avg_switches:.1f}회/일")
+    yield f"  평균 프로젝트 전환: {avg_switches:.1f}회/일"
 
     max_switch_day = context_switches.get("max_switch_day")
     max_switch_count = context_switches.get("max_switch_count", 0)
     if max_switch_day:
-        lines.append(f"  최다 전환일: {max_switch_day} ({max_switch_count}회)")
+        yield f"  최다 전환일: {max_switch_day} ({max_switch_count}회)"
     else:
-        lines.append("  최다 전환일: (데이터 없음)")
+        yield "  최다 전환일: (데이터 없음)"
 
-    return "\n".join(lines)
+
+def generate_focus_report(
+    days: int,
+    peak_hours: dict,
+    dow_analysis: dict,
+    context_switches: dict,
+) -> str:
+    """Build the formatted focus analysis report."""
+    return "\n".join(_iter_report_lines(days, peak_hours, dow_analysis, context_switches))
 
 
 # ---------------------------------------------------------------------------
 # Main run function
 # ---------------------------------------------------------------------------
 
-def run(days: int = 30, config=None) -> None:
+def run(days: int = 30, config=None, rebuild: bool = False) -> None:
     """
     Run the focus analysis agent and print insights to the terminal.
 
@@ -431,6 +771,9 @@ def run(days: int = 30, config=None) -> None:
         Number of days to look back.
     config:
         Optional Config instance.
+    rebuild:
+        Empty the focus_daily rollup first, so every settled day is
+        recomputed from file_events.
     """
     if config is None:
         config = _cfg
@@ -455,17 +798,25 @@ def run(days: int = 30, config=None) -> None:
 
     print(f"[focus_agent] Analyzing last {days} days of activity...")
 
-    file_rows = _query_file_events(db_path, days)
-    total_events = len(file_rows)
-
-    if total_events == 0:
+    try:
+        conn = _open_conn(db_path)
+    except sqlite3.Error as exc:
+        print(f"[focus_agent] DB error (open): {exc}", file=sys.stderr)
+        return
+    try:
+        if rebuild and conn is not None:
+            _write_focus_daily(conn, _SQL_CLEAR_FOCUS_DAILY)
+        buckets, day_switch_counts = _query_window(db_path, days, conn)
+    finally:
+        if conn is not None:
+            conn.close()
+
+    if not buckets:
         print(f"[focus_agent] No file events found in the last {days} days.")
         print("  Run the watcher daemon to collect data first.")
         return
 
-    peak_hours = _analyze_peak_hours(file_rows)
-    dow_analysis = _analyze_day_of_week(file_rows)
-    context_switches = _analyze_context_switches(file_rows, days)
+    peak_hours, dow_analysis, context_switches = _analyze_all(buckets, day_switch_counts)
 
     report = generate_focus_report(days, peak_hours, dow_analysis, context_switches)
     print("\n" + report + "\n")
@@ -486,9 +837,14 @@ def main() -> None:
         metavar="N",
         help="Number of days to analyze (default: 30).",
     )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute the focus_daily rollup cache from file_events.",
+    )
     args = parser.parse_args()
 
-    run(days=args.days)
+    run(days=args.days, rebuild=args.rebuild)
 
 
 if __name__ == "__main__":
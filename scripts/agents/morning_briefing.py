@@ -20,11 +20,14 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import functools
 import io
+import os
 import re
 import sqlite3
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
@@ -68,12 +71,29 @@ except Exception:
 # ---------------------------------------------------------------------------
 
 def _parse_ts(ts_str: str) -> Optional[datetime]:
+    """
+    Parse a DB timestamp. The layouts the collectors write most,
+    "YYYY-MM-DDTHH:MM:SS" and the same with a trailing "Z", are sliced
+    directly; anything else goes through datetime.fromisoformat.
+    """
     if not ts_str:
         return None
     try:
-        ts_str = ts_str.replace("Z", "+00:00")
-        return datetime.fromisoformat(ts_str)
-    except (ValueError, AttributeError):
+        n = len(ts_str)
+        if (n == 19 or (n == 20 and ts_str[19] == "Z")) and (
+            ts_str[4] == ts_str[7] == "-" and ts_str[13] == ts_str[16] == ":"
+            and ts_str[10] in "T "
+        ):
+            digits = (ts_str[0:4] + ts_str[5:7] + ts_str[8:10]
+                      + ts_str[11:13] + ts_str[14:16] + ts_str[17:19])
+            if digits.isascii() and digits.isdigit():
+                return datetime(
+                    int(digits[0:4]), int(digits[4:6]), int(digits[6:8]),
+                    int(digits[8:10]), int(digits[10:12]), int(digits[12:14]),
+                    tzinfo=timezone.utc if n == 20 else None,
+                )
+        return datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
+    except (ValueError, AttributeError, TypeError):
         return None
 
 
@@ -83,25 +103,153 @@ def _to_local(dt: Optional[datetime]) -> Optional[datetime]:
     return dt.astimezone()
 
 
+def _local_offset_window() -> Optional[tuple[int, datetime, datetime]]:
+    """
+    (offset_minutes, utc_start, utc_end) if the local UTC offset is the same
+    from three days ago to a day ahead (naive UTC bounds), the span of the
+    timestamps the briefing shows; None if a DST change falls in between.
+    """
+    now = datetime.now(timezone.utc)
+    start, end = now - timedelta(days=3), now + timedelta(days=1)
+    offset = start.astimezone().utcoffset()
+    if end.astimezone().utcoffset() != offset:
+        return None
+    return int(offset.total_seconds()) // 60, start.replace(tzinfo=None), end.replace(tzinfo=None)
+
+
+# Computed once per process; the briefing runs as a short-lived script.
+_LOCAL_OFFSET = _local_offset_window()
+
+
+def _local_hhmm(ts_str: Optional[str]) -> Optional[str]:
+    """
+    Local "HH:MM" for a DB timestamp, or None if it cannot be parsed.
+
+    Inside the _LOCAL_OFFSET window, naive timestamps are local wall time
+    already and UTC ones are shifted by a fixed offset with integer
+    arithmetic, so neither needs astimezone() or strftime(). Other offsets,
+    timestamps outside the window, or a DST change take the full _to_local
+    path.
+    """
+    dt = _parse_ts(ts_str)
+    if dt is None:
+        return None
+    if _LOCAL_OFFSET is not None and (dt.tzinfo is None or dt.tzinfo is timezone.utc):
+        offset, start, end = _LOCAL_OFFSET
+        if dt.tzinfo is None:
+            in_window = start <= dt - timedelta(minutes=offset) <= end
+            total = dt.hour * 60 + dt.minute
+        else:
+            in_window = start <= dt.replace(tzinfo=None) <= end
+            total = (dt.hour * 60 + dt.minute + offset) % 1440
+        if in_window:
+            return f"{total // 60:02d}:{total % 60:02d}"
+    return _to_local(dt).strftime("%H:%M")
+
+
+# The current local offset as a fixed tzinfo, used for the day bounds below.
+# Captured once per process: the briefing is a short-lived script, so a DST
+# change while it runs is not a concern.
+_LOCAL_TZ = datetime.now(timezone.utc).astimezone().tzinfo
+
+
+@functools.lru_cache(maxsize=32)
 def _local_day_utc_bounds(date_str: str) -> tuple[str, str]:
-    """Return (utc_start, utc_end) strings bracketing the local calendar day."""
-    local_date = datetime.strptime(date_str, "%Y-%m-%d")
-    local_tz = datetime.now(timezone.utc).astimezone().tzinfo
-    local_midnight = local_date.replace(tzinfo=local_tz)
-    local_next = local_midnight + timedelta(days=1)
+    """
+    Return (utc_start, utc_end) strings bracketing the local calendar day.
+    Memoised: run() asks for the same one or two days repeatedly.
+    date_str is always "YYYY-MM-DD", so it is sliced instead of strptime'd.
+    """
+    local_midnight = datetime(
+        int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]), tzinfo=_LOCAL_TZ
+    )
     utc_start = local_midnight.astimezone(timezone.utc)
-    utc_end = local_next.astimezone(timezone.utc)
+    utc_end = (local_midnight + timedelta(days=1)).astimezone(timezone.utc)
     return (
-        utc_start.strftime("%Y-%m-%dT%H:%M:%S"),
-        utc_end.strftime("%Y-%m-%dT%H:%M:%S"),
+        f"{utc_start.year:04d}-{utc_start.month:02d}-{utc_start.day:02d}"
+        f"T{utc_start.hour:02d}:{utc_start.minute:02d}:{utc_start.second:02d}",
+        f"{utc_end.year:04d}-{utc_end.month:02d}-{utc_end.day:02d}"
+        f"T{utc_end.hour:02d}:{utc_end.minute:02d}:{utc_end.second:02d}",
     )
 
 
+# ---------------------------------------------------------------------------
+# DB queries
+# ---------------------------------------------------------------------------
+
+# Per-project AI prompt and file event counts and latest timestamp for
+# yesterday, merged and ordered by total activity in SQL (ties: more AI
+# prompts first, then name), followed by one is_today = 1 row carrying
+# today's earliest activity_log timestamp in last_ts. Each branch is an index
+# range search on a DB initialised by init_db (idx_ai_timestamp covers the
+# ai_prompts one). Params: (yest_start, yest_end, yest_start, yest_end,
+# today_start)
+_SQL_YESTERDAY_SUMMARY = """
+    WITH per_src AS (
+        SELECT COALESCE(p.name, 'unknown') AS proj_name,
+               COUNT(*) AS ai_count, 0 AS file_count,
+               MAX(ap.timestamp) AS last_ts
+        FROM ai_prompts ap
+        LEFT JOIN projects p ON ap.project_id = p.id
+        WHERE ap.timestamp >= ? AND ap.timestamp < ?
+        GROUP BY proj_name
+        UNION ALL
+        SELECT COALESCE(p.name, 'unknown') AS proj_name,
+               0, COUNT(*), MAX(fe.timestamp)
+        FROM file_events fe
+        LEFT JOIN projects p ON fe.project_id = p.id
+        WHERE fe.timestamp >= ? AND fe.timestamp < ?
+        GROUP BY proj_name
+    )
+    SELECT 0 AS is_today, proj_name AS name,
+           SUM(ai_count) AS ai_count, SUM(file_count) AS file_count,
+           MAX(last_ts) AS last_ts,
+           SUM(ai_count) + SUM(file_count) AS total
+    FROM per_src
+    GROUP BY proj_name
+    UNION ALL
+    SELECT 1, NULL, NULL, NULL, MIN(timestamp), NULL
+    FROM activity_log
+    WHERE timestamp >= ?
+    ORDER BY is_today, total DESC, ai_count DESC, name
+"""
+
+# Most recent file event with its project name.
+_SQL_LAST_FILE = """
+    SELECT fe.file_path, fe.event_type, fe.timestamp,
+           COALESCE(p.name, 'unknown') AS project_name
+    FROM file_events fe
+    LEFT JOIN projects p ON fe.project_id = p.id
+    ORDER BY fe.timestamp DESC
+    LIMIT 1
+"""
+
+
+def _open_conn(db_path: str) -> Optional[sqlite3.Connection]:
+    """
+    Open the worklog DB for the briefing queries, or return None if missing.
+
+    The briefing only reads, so the connection is query_only with in-memory
+    temp storage (GROUP BY / ORDER BY sorts). run() opens one connection and
+    passes it to every helper so the schema is loaded and the page cache
+    warmed only once.
+    """
+    if not os.path.isfile(db_path):
+        return None
+    conn = sqlite3.connect(db_path, timeout=10, cached_statements=128)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only = 1")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
 # ---------------------------------------------------------------------------
 # Core data-gathering functions
 # ---------------------------------------------------------------------------
 
-def get_yesterday_summary(db_path: str, vault_path: str) -> dict:
+def get_yesterday_summary(
+    db_path: str, vault_path: str, conn: Optional[sqlite3.Connection] = None
+) -> dict:
     """
     Query yesterday's activity from the database.
 
@@ -111,6 +259,8 @@ def get_yesterday_summary(db_path: str, vault_path: str) -> dict:
         total_ai      - total AI sessions yesterday
         total_files   - total file events yesterday
         earliest_today - earliest activity_log timestamp for today (or None)
+
+    Uses *conn* if given (see _open_conn), otherwise opens and closes its own.
     """
     yesterday = (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
     today_str = date.today().strftime("%Y-%m-%d")
@@ -123,108 +273,75 @@ def get_yesterday_summary(db_path: str, vault_path: str) -> dict:
         "earliest_today": None,
     }
 
-    if not Path(db_path).exists():
-        return result
-
     yest_start, yest_end = _local_day_utc_bounds(yesterday)
     today_start, _ = _local_day_utc_bounds(today_str)
 
+    own_conn = conn is None
     try:
-        with sqlite3.connect(db_path, timeout=10) as conn:
-            conn.row_factory = sqlite3.Row
-
-            # AI prompts per project for yesterday
-            ai_rows = conn.execute(
-                """
-                SELECT COALESCE(p.name, 'unknown') AS proj_name,
-                       COUNT(*) AS cnt,
-                       MAX(ap.timestamp) AS last_ts
-                FROM ai_prompts ap
-                LEFT JOIN projects p ON ap.project_id = p.id
-                WHERE ap.timestamp >= ? AND ap.timestamp < ?
-                GROUP BY proj_name
-                ORDER BY cnt DESC
-                """,
-                (yest_start, yest_end),
-            ).fetchall()
-
-            # File events per project for yesterday
-            file_rows = conn.execute(
-                """
-                SELECT COALESCE(p.name, 'unknown') AS proj_name,
-                       COUNT(*) AS cnt,
-                       MAX(fe.timestamp) AS last_ts
-                FROM file_events fe
-                LEFT JOIN projects p ON fe.project_id = p.id
-                WHERE fe.timestamp >= ? AND fe.timestamp < ?
-                GROUP BY proj_name
-                ORDER BY cnt DESC
-                """,
-                (yest_start, yest_end),
-            ).fetchall()
-
-            # Merge: combine ai + file per project
-            ai_map: dict[str, dict] = {}
-            for r in ai_rows:
-                name = r["proj_name"]
-                ai_map[name] = {
-                    "name": name,
-                    "ai_count": r["cnt"],
-                    "file_count": 0,
-                    "last_ts": r["last_ts"],
-                }
-            for r in file_rows:
-                name = r["proj_name"]
-                if name in ai_map:
-                    ai_map[name]["file_count"] = r["cnt"]
-                    # keep latest timestamp
-                    if r["last_ts"] and (
-                        not ai_map[name]["last_ts"]
-                        or r["last_ts"] > ai_map[name]["last_ts"]
-                    ):
-                        ai_map[name]["last_ts"] = r["last_ts"]
-                else:
-                    ai_map[name] = {
-                        "name": name,
-                        "ai_count": 0,
-                        "file_count": r["cnt"],
-                        "last_ts": r["last_ts"],
-                    }
-
-            # Sort by total activity descending
-            projects_list = sorted(
-                ai_map.values(),
-                key=lambda x: x["ai_count"] + x["file_count"],
-                reverse=True,
+        if own_conn:
+            conn = _open_conn(db_path)
+            if conn is None:
+                return result
+
+        # One round trip: AI prompts and file events merged per project for
+        # yesterday and already sorted, then today's earliest activity_log row
+        *project_rows, today_row = conn.execute(
+            _SQL_YESTERDAY_SUMMARY,
+            (yest_start, yest_end, yest_start, yest_end, today_start),
+        ).fetchall()
+        earliest_today: Optional[str] = today_row["last_ts"]
+
+        # Totals are accumulated while the dicts are built
+        projects_list: list[dict] = []
+        total_ai = total_files = 0
+        for _, name, ai_c, file_c, ts, _ in project_rows:
+            projects_list.append(
+                {"name": name, "ai_count": ai_c, "file_count": file_c, "last_ts": ts}
             )
-            result["projects"] = projects_list
-            result["total_ai"] = sum(p["ai_count"] for p in projects_list)
-            result["total_files"] = sum(p["file_count"] for p in projects_list)
-
-            # Earliest activity for today
-            today_row = conn.execute(
-                """
-                SELECT MIN(timestamp) AS earliest
-                FROM activity_log
-                WHERE timestamp >= ?
-                """,
-                (today_start,),
-            ).fetchone()
-            if today_row and today_row["earliest"]:
-                dt = _to_local(_parse_ts(today_row["earliest"]))
-                result["earliest_today"] = dt.strftime("%H:%M") if dt else None
+            total_ai += ai_c
+            total_files += file_c
+        result["projects"] = projects_list
+        result["total_ai"] = total_ai
+        result["total_files"] = total_files
+
+        # Earliest activity for today
+        if earliest_today:
+            result["earliest_today"] = _local_hhmm(earliest_today)
 
     except Exception as exc:  # noqa: BLE001
         print(f"[morning_briefing] WARNING: DB query failed: {exc}", file=sys.stderr)
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
 
     return result
 
 
+# "- [ ] text", optionally indented; \s is Unicode whitespace on str, as in
+# the original per-line re.match.
+_TODO_RE = re.compile(r"^\s*-\s+\[\s+\]\s+(.*)")
+
+
+def _scan_todos(content: str) -> list[str]:
+    """TODO texts in a note's content, see get_incomplete_todos."""
+    todos = []
+    for line in content.splitlines():
+        # Every TODO line has a "[": skip the regex on the rest
+        if "[" in line:
+            m = _TODO_RE.match(line)
+            if m:
+                todos.append(m.group(1).strip())
+    return todos
+
+
 def get_incomplete_todos(vault_path: str, date_str: str) -> list[str]:
     """
     Extract incomplete TODO lines (- [ ] ...) from the Daily Note for date_str.
 
     Returns a list of todo text strings (without the leading '- [ ] ').
+
+    A TODO line is "- [ ] text", optionally indented, with any whitespace
+    as indent, separators and box (see _TODO_RE).
     """
     note_path = Path(vault_path) / "Daily" / f"{date_str}.md"
     if not note_path.exists():
@@ -232,104 +349,53 @@ def get_incomplete_todos(vault_path: str, date_str: str) -> list[str]:
 
     todos: list[str] = []
     try:
-        content = note_path.read_text(encoding="utf-8")
-        for line in content.splitlines():
-            # Match both "- [ ] text" and "  - [ ] text" (indented)
-            m = re.match(r"^\s*-\s+\[\s+\]\s+(.*)", line)
-            if m:
-                todos.append(m.group(1).strip())
+        todos = _scan_todos(note_path.read_text(encoding="utf-8"))
     except Exception as exc:  # noqa: BLE001
         print(f"[morning_briefing] WARNING: Could not read daily note: {exc}", file=sys.stderr)
 
     return todos
 
 
-def get_last_modified_file(db_path: str) -> Optional[dict]:
+def get_last_modified_file(
+    db_path: str, conn: Optional[sqlite3.Connection] = None
+) -> Optional[dict]:
     """
     Return info about the most recently modified file in file_events.
 
     Returns a dict with keys: file_path, event_type, timestamp, project_name
     Or None if no records exist.
-    """
-    if not Path(db_path).exists():
-        return None
 
+    Uses *conn* if given (see _open_conn), otherwise opens and closes its own.
+    """
+    own_conn = conn is None
     try:
-        with sqlite3.connect(db_path, timeout=10) as conn:
-            conn.row_factory = sqlite3.Row
-            row = conn.execute(
-                """
-                SELECT fe.file_path, fe.event_type, fe.timestamp,
-                       COALESCE(p.name, 'unknown') AS project_name
-                FROM file_events fe
-                LEFT JOIN projects p ON fe.project_id = p.id
-                ORDER BY fe.timestamp DESC
-                LIMIT 1
-                """,
-            ).fetchone()
+        if own_conn:
+            conn = _open_conn(db_path)
+            if conn is None:
+                return None
+        row = conn.execute(_SQL_LAST_FILE).fetchone()
         if row:
             return dict(row)
     except Exception as exc:  # noqa: BLE001
         print(f"[morning_briefing] WARNING: Could not query last file: {exc}", file=sys.stderr)
+    finally:
+        if own_conn and conn is not None:
+            conn.close()
 
     return None
 
 
-def _get_most_recent_project(db_path: str, yesterday: str) -> Optional[dict]:
+def _get_most_recent_project(projects: list[dict]) -> Optional[dict]:
     """
-    Return the project with the latest activity timestamp yesterday.
+    Return the project with the latest activity timestamp yesterday, picked
+    from get_yesterday_summary()["projects"] (whose last_ts already covers
+    both AI prompts and file events), so no extra query is needed.
     Returns dict with keys: name, last_ts
     """
-    if not Path(db_path).exists():
-        return None
-
-    yest_start, yest_end = _local_day_utc_bounds(yesterday)
-
-    try:
-        with sqlite3.connect(db_path, timeout=10) as conn:
-            conn.row_factory = sqlite3.Row
-            # Check ai_prompts for latest
-            ai_row = conn.execute(
-                """
-                SELECT COALESCE(p.name, 'unknown') AS proj_name,
-                       MAX(ap.timestamp) AS last_ts
-                FROM ai_prompts ap
-                LEFT JOIN projects p ON ap.project_id = p.id
-                WHERE ap.timestamp >= ? AND ap.timestamp < ?
-                GROUP BY proj_name
-                ORDER BY last_ts DESC
-                LIMIT 1
-                """,
-                (yest_start, yest_end),
-            ).fetchone()
-            fe_row = conn.execute(
-                """
-                SELECT COALESCE(p.name, 'unknown') AS proj_name,
-                       MAX(fe.timestamp) AS last_ts
-                FROM file_events fe
-                LEFT JOIN projects p ON fe.project_id = p.id
-                WHERE fe.timestamp >= ? AND fe.timestamp < ?
-                GROUP BY proj_name
-                ORDER BY last_ts DESC
-                LIMIT 1
-                """,
-                (yest_start, yest_end),
-            ).fetchone()
-
-        candidates = []
-        if ai_row and ai_row["last_ts"]:
-            candidates.append({"name": ai_row["proj_name"], "last_ts": ai_row["last_ts"]})
-        if fe_row and fe_row["last_ts"]:
-            candidates.append({"name": fe_row["proj_name"], "last_ts": fe_row["last_ts"]})
-
-        if not candidates:
-            return None
-
-        return max(candidates, key=lambda x: x["last_ts"])
-
-    except Exception as exc:  # noqa: BLE001
-        print(f"[morning_briefing] WARNING: Could not query recent project: {exc}", file=sys.stderr)
+    latest = max((p for p in projects if p["last_ts"]), key=lambda p: p["last_ts"], default=None)
+    if latest is None:
         return None
+    return {"name": latest["name"], "last_ts": latest["last_ts"]}
 
 
 # ---------------------------------------------------------------------------
@@ -379,8 +445,7 @@ def generate_short_briefing(data: dict) -> str:
     if most_recent:
         proj_name = most_recent["name"]
         last_ts_raw = most_recent.get("last_ts", "")
-        last_dt = _to_local(_parse_ts(last_ts_raw))
-        last_ts_str = last_dt.strftime("%H:%M") if last_dt else "?"
+        last_ts_str = _local_hhmm(last_ts_raw) or "?"
         lines.append(f"마지막: {last_ts_str} ({proj_name})")
 
     # Line 3 (optional): today's first activity
@@ -390,59 +455,74 @@ def generate_short_briefing(data: dict) -> str:
     return "\n".join(lines)
 
 
+# Fixed layout of the full briefing; only the blocks below vary per run.
+_BRIEFING_TEMPLATE = (
+    "☀️ DayTracker 모닝 브리핑 ({today_str})\n"
+    "==============================\n"
+    "📂 [어제 활동한 프로젝트]\n"
+    "{projects_block}\n"
+    "\n"
+    "📝 [남은 할 일 (TODO)]\n"
+    "{todos_block}\n"
+    "\n"
+    "🚀 [추천 시작 포인트]\n"
+    "{start_block}\n"
+    "\n"
+    "🌱 [오늘]\n"
+    "{today_block}"
+)
+
+
 def generate_briefing(data: dict) -> str:
+    """
+    Build the full morning briefing text by filling _BRIEFING_TEMPLATE.
+    Each block is one or more "  • ..." lines without a trailing newline.
+    """
     today_str: str = data.get("today_str", date.today().strftime("%Y-%m-%d"))
-    yesterday_str: str = data.get("yesterday_str", "")
     projects: list[dict] = data.get("projects", [])
     todos: list[str] = data.get("todos", [])
     last_file: Optional[dict] = data.get("last_file")
     most_recent: Optional[dict] = data.get("most_recent_project")
     earliest_today: Optional[str] = data.get("earliest_today")
 
-    lines: list[str] = []
-
-    lines.append(f"☀️ DayTracker 모닝 브리핑 ({today_str})")
-    lines.append("="*30)
-
-    lines.append("📂 [어제 활동한 프로젝트]")
     if projects:
-        for proj in projects[:3]: # 상위 3개 제한
-            name = proj["name"]
-            ai_c, file_c = proj["ai_count"], proj["file_count"]
-            lines.append(f"  • {name} (AI {ai_c}건 / 파일 {file_c}건)")
+        # 상위 3개 제한
+        projects_block = "\n".join(
+            f"  • {p['name']} (AI {p['ai_count']}건 / 파일 {p['file_count']}건)"
+            for p in projects[:3]
+        )
     else:
-        lines.append("  • 활동 기록 없음")
-    lines.append("")
+        projects_block = "  • 활동 기록 없음"
 
-    lines.append("📝 [남은 할 일 (TODO)]")
     if todos:
-        for todo in todos[:3]: # 너무 길면 깨질수 있으므로 3개까지만 제한
-            lines.append(f"  • [ ] {todo}")
+        # 너무 길면 깨질수 있으므로 3개까지만 제한
+        todos_block = "\n".join(f"  • [ ] {todo}" for todo in todos[:3])
         if len(todos) > 3:
-            lines.append(f"  ...외 {len(todos)-3}건")
+            todos_block += f"\n  ...외 {len(todos)-3}건"
     else:
-        lines.append("  • 남은 일 없음. 완벽해요! ✨")
-    lines.append("")
+        todos_block = "  • 남은 일 없음. 완벽해요! ✨"
 
-    lines.append("🚀 [추천 시작 포인트]")
+    start_lines: list[str] = []
     if most_recent:
-        last_dt = _to_local(_parse_ts(most_recent.get("last_ts", "")))
-        last_ts_str = last_dt.strftime("%H:%M") if last_dt else "?"
-        lines.append(f"  • 최근 프로젝트: {most_recent['name']} ({last_ts_str})")
+        last_ts_str = _local_hhmm(most_recent.get("last_ts", "")) or "?"
+        start_lines.append(f"  • 최근 프로젝트: {most_recent['name']} ({last_ts_str})")
     if last_file:
         fp_display = Path(last_file.get("file_path", "")).name if last_file.get("file_path") else "?"
-        lines.append(f"  • 마지막 파일: {fp_display}")
-    if not most_recent and not last_file:
-        lines.append("  • 이전 활동 없음")
-    lines.append("")
+        start_lines.append(f"  • 마지막 파일: {fp_display}")
+    start_block = "\n".join(start_lines) or "  • 이전 활동 없음"
 
-    lines.append("🌱 [오늘]")
     if earliest_today:
-        lines.append(f"  • 오늘 첫 시작: {earliest_today}")
+        today_block = f"  • 오늘 첫 시작: {earliest_today}"
     else:
-        lines.append("  • 아직 오늘 활동 기록이 없어요. 시작해볼까요?")
-    
-    return "\n".join(lines)
+        today_block = "  • 아직 오늘 활동 기록이 없어요. 시작해볼까요?"
+
+    return _BRIEFING_TEMPLATE.format_map({
+        "today_str": today_str,
+        "projects_block": projects_block,
+        "todos_block": todos_block,
+        "start_block": start_block,
+        "today_block": today_block,
+    })
 
 
 # ---------------------------------------------------------------------------
@@ -451,7 +531,7 @@ def generate_briefing(data: dict) -> str:
 
 def _write_briefing_note(vault_path: str, today_str: str, content: str) -> str:
     """
-    Write the briefing to {vault}/Briefings/YYYY-MM-DD-morning.md.
+    Write the briefing text to {vault}/Briefings/YYYY-MM-DD-morning.md.
     Returns the path that was written.
     """
     briefings_dir = Path(vault_path) / "Briefings"
@@ -470,9 +550,10 @@ def _write_briefing_note(vault_path: str, today_str: str, content: str) -> str:
 
     # Convert plain-text briefing to Markdown-friendly form
     # Replace box-drawing lines with fenced code or leave as-is (it's readable)
-    note_content = frontmatter + heading + content
-
-    note_path.write_text(note_content, encoding="utf-8")
+    with note_path.open("w", encoding="utf-8") as f:
+        f.write(frontmatter)
+        f.write(heading)
+        f.write(content)
     return str(note_path)
 
 
@@ -509,11 +590,32 @@ def run(dry_run: bool = False, short: bool = False) -> None:
 
     db_path = cfg.get_db_path()
 
-    # Gather data
-    summary = get_yesterday_summary(db_path, vault_path)
-    todos = get_incomplete_todos(vault_path, yesterday_str)
-    last_file = get_last_modified_file(db_path)
-    most_recent_project = _get_most_recent_project(db_path, yesterday_str)
+    # Gather data (one shared DB connection for all queries). The DB file is
+    # checked once, in _open_conn; without a connection the helpers are
+    # skipped rather than each probing the path again.
+    try:
+        conn = _open_conn(db_path)
+    except sqlite3.Error as exc:
+        print(f"[morning_briefing] WARNING: Could not open DB: {exc}", file=sys.stderr)
+        conn = None
+    summary: dict = {"projects": [], "earliest_today": None}
+    last_file: Optional[dict] = None
+
+    # Daily note read (file IO) overlaps with the DB queries
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        todos_future = pool.submit(get_incomplete_todos, vault_path, yesterday_str)
+        if conn is not None:
+            try:
+                # One read transaction around all queries: a single snapshot and
+                # one shared-lock acquisition instead of one per statement
+                conn.execute("BEGIN")
+                summary = get_yesterday_summary(db_path, vault_path, conn)
+                last_file = get_last_modified_file(db_path, conn)
+            finally:
+                conn.commit()
+                conn.close()
+        todos = todos_future.result()
+    most_recent_project = _get_most_recent_project(summary["projects"])
 
     data = {
         "today_str": today_str,
@@ -530,7 +632,7 @@ def run(dry_run: bool = False, short: bool = False) -> None:
         print(generate_short_briefing(data))
         return
 
-    # Generate briefing text
+    # Generate briefing
     briefing_text = generate_briefing(data)
 
     # Print to terminal
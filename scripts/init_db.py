@@ -74,16 +74,45 @@ TABLES: list[str] = [
         file_size    INTEGER
     )
     """,
+
+    # focus_daily: per-day rollup cache for scripts/agents/focus_agent.py
+    """
+    CREATE TABLE IF NOT EXISTS focus_daily (
+        day          TEXT    PRIMARY KEY,
+        utc_offset   INTEGER NOT NULL,
+        hour_counts  BLOB    NOT NULL,
+        switches     INTEGER NOT NULL,
+        n_events     INTEGER NOT NULL,
+        max_rowid    INTEGER NOT NULL
+    )
+    """,
 ]
 
+# Derived cache tables (rebuilt from other tables by their readers): if an
+# existing one lacks any of these columns it is dropped and recreated.
+CACHE_TABLES: dict[str, set[str]] = {
+    "focus_daily": {"day", "utc_offset", "hour_counts", "switches", "n_events", "max_rowid"},
+}
+
 INDEXES: list[str] = [
     "CREATE INDEX IF NOT EXISTS idx_activity_timestamp ON activity_log(timestamp)",
     "CREATE INDEX IF NOT EXISTS idx_activity_project   ON activity_log(project_id)",
     "CREATE INDEX IF NOT EXISTS idx_file_path          ON file_events(file_path)",
+    "CREATE INDEX IF NOT EXISTS idx_file_timestamp     ON file_events(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_ai_timestamp       ON ai_prompts(timestamp, project_id)",
     "CREATE INDEX IF NOT EXISTS idx_ai_session         ON ai_prompts(session_id)",
     "CREATE INDEX IF NOT EXISTS idx_ai_project         ON ai_prompts(project_id)",
 ]
 
+# Indexes on columns that only some writers add: ai_prompts.project exists when
+# the table was created by collectors/claude_code.py or server.py. Each is
+# created only if (table, column) exists; otherwise it is reported as skipped.
+COLUMN_INDEXES: list[tuple[str, str, str]] = [
+    # context_agent looks prompts up by project name, newest first
+    ("ai_prompts", "project",
+     "CREATE INDEX IF NOT EXISTS idx_ai_prompts_project ON ai_prompts(project, timestamp DESC)"),
+]
+
 
 # ---------------------------------------------------------------------------
 # Main initializer
@@ -129,6 +158,13 @@ def init_db(db_path: str | Path | None = None) -> str:
             # Extract table name for reporting
             table_name = _extract_name(ddl, "TABLE")
             try:
+                if table_name in CACHE_TABLES:
+                    columns = {
+                        row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")
+                    }
+                    if columns and not CACHE_TABLES[table_name] <= columns:
+                        print(f"[init_db] Recreating outdated cache table {table_name}")
+                        conn.execute(f"DROP TABLE {table_name}")
                 conn.execute(ddl)
                 # Check if table already existed before this run
                 row = conn.execute(
@@ -158,12 +194,29 @@ def init_db(db_path: str | Path | None = None) -> str:
                     file=sys.stderr,
                 )
 
+        for table, column, ddl in COLUMN_INDEXES:
+            idx_name = _extract_index_name(ddl)
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                skipped_indexes.append(idx_name)
+                continue
+            try:
+                conn.execute(ddl)
+                created_indexes.append(idx_name)
+            except sqlite3.Error as exc:
+                print(
+                    f"[init_db] ERROR creating index {idx_name}: {exc}",
+                    file=sys.stderr,
+                )
+
         conn.commit()
 
     # --- Summary ---
     print(f"\n[init_db] Database ready: {db_path}")
     print(f"  Tables  : {', '.join(created_tables) if created_tables else '(none)'}")
     print(f"  Indexes : {', '.join(created_indexes) if created_indexes else '(none)'}")
+    if skipped_indexes:
+        print(f"  Skipped : {', '.join(skipped_indexes)} (column not present)")
     print(
         "\n  Tables present: "
         + _list_tables(str(db_path))
@@ -0,0 +1,62 @@
+"""
+Tests for scripts/agents/morning_briefing.py: TODO extraction from the
+Daily Note.
+
+Run from the project root:
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+
+import scripts.config
+
+# Importing the agent builds a Config, which would copy config.example.yaml
+# into the project root; the TODO parser does not need one.
+with mock.patch.object(scripts.config, "Config", side_effect=RuntimeError):
+    from scripts.agents import morning_briefing
+
+
+def _write_note(tmp_path, content: str, date_str: str = "2026-01-01") -> str:
+    daily = tmp_path / "Daily"
+    daily.mkdir()
+    (daily / f"{date_str}.md").write_bytes(content.encode("utf-8"))
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("- [ ] plain", "plain"),
+        ("  - [ ] indented", "indented"),
+        ("\t- [ ] tab indent", "tab indent"),
+        ("- [  ] wide box", "wide box"),
+        ("- [\t] tab box", "tab box"),
+        ("-\xa0[ ]\xa0nbsp separators", "nbsp separators"),
+        ("\u3000- [ ] ideographic indent", "ideographic indent"),
+        ("-   [ ]   spaced  ", "spaced"),
+        ("- [x] done", None),
+        ("- [] no space", None),
+        ("-[ ] no separator", None),
+        ("- [ ]", None),
+        ("text - [ ] not at start", None),
+    ],
+)
+def test_todo_line_forms(tmp_path, line, expected):
+    vault = _write_note(tmp_path, f"# Daily\n{line}\nafter\n")
+    todos = morning_briefing.get_incomplete_todos(vault, "2026-01-01")
+    assert todos == ([] if expected is None else [expected])
+
+
+def test_todos_split_like_splitlines(tmp_path):
+    content = "- [ ] a\r\n- [ ] b\r- [ ] c\u2028- [ ] d\x0c- [ ] e"
+    vault = _write_note(tmp_path, content)
+    todos = morning_briefing.get_incomplete_todos(vault, "2026-01-01")
+    assert todos == ["a", "b", "c", "d", "e"]
+
+
+def test_missing_note(tmp_path):
+    assert morning_briefing.get_incomplete_todos(str(tmp_path), "2026-01-01") == []